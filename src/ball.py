@@ -6,8 +6,11 @@ if TYPE_CHECKING:
 
 
 class Ball:
+    # One instance per ball for the whole run; slots keep them compact with fast attribute access
+    __slots__ = ('position', 'velocity', 'radius', 'index', 'cell', 'time', 'events', 'version', 'state')
+    
     def __init__(self, position: np.ndarray, velocity: np.ndarray, radius: float, index: int, 
-                 cell: Tuple[int, ...], time: float = 0.0):
+                 cell: Tuple[int, ...], time: float = 0.0, copy: bool = True):
         """
         Initialize a Ball object.
         
@@ -18,14 +21,51 @@ class Ball:
             index: index in the balls list
             cell: tuple of cell indices (i, j) for 2D or (i, j, k) for 3D
             time: time of most recent collision (default 0.0)
+            copy: store floating-point copies of position and velocity (default True); integer
+                input is converted to float64. Pass False to keep the given arrays, e.g. row
+                views into shared (N, ndim) state arrays.
         """
-        self.position = position.copy()
-        self.velocity = velocity.copy()
+        if copy:
+            # Copies are always floating point (float32 state stays float32), so in-place
+            # updates never truncate or fail on integer input
+            position = np.array(position, dtype=np.promote_types(np.asarray(position).dtype, np.float32))
+            velocity = np.array(velocity, dtype=np.promote_types(np.asarray(velocity).dtype, np.float32))
+        self.position = position
+        self.velocity = velocity
         self.radius = radius
         self.index = index
         self.cell = cell
         self.time = time
         self.events: List['Event'] = []
+        self.version = 0  # bumped whenever the trajectory changes; events snapshot it
+        self.state = None  # shared BallState this ball is bound to, if any
+    
+    @classmethod
+    def bind(cls, state: 'BallState') -> List['Ball']:
+        """
+        Create one ball per row of a shared BallState.
+        
+        Each ball's position and velocity are row views, so in-place updates to a ball
+        are visible in the shared arrays and vice versa; time and cell changes are
+        written back to the state.
+        
+        Args:
+            state: shared state of N balls
+            
+        Returns:
+            list of N balls, ball i bound to row i
+        """
+        balls = []
+        rows = zip(state.radii.tolist(), map(tuple, state.cells.tolist()), state.times.tolist())
+        for i, (radius, cell, time) in enumerate(rows):
+            ball = cls(state.positions[i], state.velocities[i], radius, i, cell, time, copy=False)
+            ball.state = state
+            balls.append(ball)
+        return balls
+    
+    def copy(self) -> 'Ball':
+        """Copy of this ball's state (position, velocity, radius, index, cell, time), without its events."""
+        return Ball(self.position, self.velocity, self.radius, self.index, self.cell, self.time)
     
     def get_position_and_velocity_at_time(self, t: float, ndim: int, gravity: bool = False) -> Tuple[np.ndarray, np.ndarray]:
         """
@@ -43,22 +83,44 @@ class Ball:
         if dt < 0:
             raise ValueError(f"Cannot get position/velocity at time {t} before ball's current time {self.time}")
         
-        # Calculate position
+        # Calculate position and velocity
         position = self.position + self.velocity * dt
+        velocity = self.velocity.copy()
         
         if gravity and ndim >= 2:
-            # Add gravitational displacement (gravity acts in negative y direction, g=1 in scaled time)
-            gravity_displacement = np.zeros_like(self.position)
-            gravity_displacement[1] = -0.5 * dt * dt  # g=1 in scaled time units
-            position += gravity_displacement
+            # Gravity acts in negative y direction, g=1 in scaled time units: only y changes
+            position[1] -= 0.5 * dt * dt
+            velocity[1] -= dt
         
-        # Calculate velocity
-        velocity = self.velocity.copy()
-        if gravity and ndim >= 2:
-            # Velocity changes due to gravity: v = v0 + g*t (g acts in negative y direction)
-            gravity_velocity = np.zeros_like(self.velocity)
-            gravity_velocity[1] = -dt  # g=1 in scaled time units
-            velocity += gravity_velocity
+        return position, velocity
+    
+    def get_state_at_time(self, t: float, ndim: int, gravity: bool = False) -> Tuple[List[float], List[float]]:
+        """
+        Calculate ball position and velocity at given time as Python floats.
+        
+        Scalar counterpart of get_position_and_velocity_at_time for callers that work
+        component by component. Event processing updates a ball to the event time before
+        generating its next events, so at dt == 0 this is a plain read of the stored state.
+        
+        Args:
+            t: target time
+            ndim: number of dimensions (2 or 3) - world property
+            gravity: whether gravity is enabled (g=1 in scaled time units)
+            
+        Returns:
+            tuple of (position, velocity) lists at time t
+        """
+        dt = t - self.time
+        if dt < 0:
+            raise ValueError(f"Cannot get position/velocity at time {t} before ball's current time {self.time}")
+        
+        position = self.position.tolist()
+        velocity = self.velocity.tolist()
+        if dt > 0:
+            position = [p + v * dt for p, v in zip(position, velocity)]
+            if gravity and ndim >= 2:
+                position[1] -= 0.5 * dt * dt
+                velocity[1] -= dt
         
         return position, velocity
     
@@ -76,16 +138,36 @@ class Ball:
         
         dt = t - self.time
         
-        # Update position and velocity
-        self.position, self.velocity = self.get_position_and_velocity_at_time(t, ndim, gravity)
+        # Update position and velocity in place so views into shared state arrays stay in sync
+        self.position += self.velocity * dt
+        if gravity and ndim >= 2:
+            self.position[1] -= 0.5 * dt * dt
+            self.velocity[1] -= dt
         
         # Update time
         self.time = t
+        if self.state is not None:
+            self.state.times[self.index] = t
+    
+    def set_cell(self, cell: Tuple[int, ...]):
+        """
+        Move the ball to a new grid cell.
+        
+        Args:
+            cell: tuple of cell indices of the new cell
+        """
+        self.cell = cell
+        if self.state is not None:
+            self.state.cells[self.index] = cell
     
     def invalidate_all_events(self):
-        """Mark all events involving this ball as invalid."""
-        for event in self.events:
-            event.valid = False
+        """
+        Mark all events involving this ball as invalid.
+        
+        Bumping the version makes every event that snapshotted the old version stale,
+        so the scheduled events do not have to be visited one by one.
+        """
+        self.version += 1
         self.events.clear()
     
     def add_event(self, event: 'Event'):
@@ -93,4 +175,83 @@ class Ball:
         self.events.append(event)
     
     def __repr__(self):
-        return f"Ball(pos={self.position}, vel={self.velocity}, r={self.radius}, i={self.index}, cell={self.cell}, t={self.time})"
\ No newline at end of file
+        return f"Ball(pos={self.position}, vel={self.velocity}, r={self.radius}, i={self.index}, cell={self.cell}, t={self.time})"
+
+
+class BallState:
+    """
+    Contiguous state of all balls in a run, one row per ball.
+    
+    Balls created by Ball.bind are views of these arrays: positions and velocities
+    are shared rows, and each ball writes its time and cell back when they change,
+    so the arrays always hold every ball's current trajectory.
+    """
+    
+    __slots__ = ('positions', 'velocities', 'times', 'radii', 'cells')
+    
+    def __init__(self, positions: np.ndarray, velocities: np.ndarray, times: np.ndarray,
+                 radii: np.ndarray, cells: np.ndarray):
+        """
+        Initialize ball state from existing arrays (not copied).
+        
+        Args:
+            positions: (N, ndim) positions at each ball's reference time
+            velocities: (N, ndim) velocities at each ball's reference time
+            times: (N,) float64 reference times
+            radii: (N,) ball radii
+            cells: (N, ndim) int32 cell indices
+        """
+        self.positions = positions
+        self.velocities = velocities
+        self.times = times
+        self.radii = radii
+        self.cells = cells
+    
+    @classmethod
+    def from_balls(cls, balls: List[Ball]) -> 'BallState':
+        """
+        Gather the state of individually constructed balls into new arrays.
+        
+        Balls created with Ball.bind already share a BallState; this is for balls
+        built one at a time, e.g. in tests.
+        
+        Args:
+            balls: list of balls
+            
+        Returns:
+            state holding copies of the balls' current trajectories
+        """
+        return cls(np.array([ball.position for ball in balls]),
+                   np.array([ball.velocity for ball in balls]),
+                   np.fromiter((ball.time for ball in balls), dtype=np.float64, count=len(balls)),
+                   np.array([ball.radius for ball in balls]),
+                   np.array([ball.cell for ball in balls], dtype=np.int32))
+    
+    def at_time(self, t: float, ndim: int, gravity: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate all ball positions and velocities at time t in one array sweep.
+        
+        Same result as calling get_position_and_velocity_at_time on each ball, stacked into
+        (N, ndim) arrays; the time step is cast to the state dtype the way the per-ball
+        scalar arithmetic is. The stored state is not modified.
+        
+        Args:
+            t: target time, not earlier than any ball's current time
+            ndim: number of dimensions (2 or 3) - world property
+            gravity: whether gravity is enabled (g=1 if True, scaled time units)
+            
+        Returns:
+            tuple of (positions, velocities) arrays at time t
+        """
+        late = np.flatnonzero(self.times > t)
+        if late.size:
+            raise ValueError(f"Cannot get position/velocity at time {t} before ball's current time {self.times[late[0]]}")
+        
+        dt = t - self.times
+        positions = self.positions + self.velocities * dt.astype(self.positions.dtype)[:, np.newaxis]
+        velocities = self.velocities.copy()
+        if gravity and ndim >= 2:
+            positions[:, 1] -= (0.5 * dt * dt).astype(positions.dtype)
+            velocities[:, 1] -= dt.astype(velocities.dtype)
+        
+        return positions, velocities
@@ -1,9 +1,15 @@
+import json
+import numpy as np
 from typing import List, TYPE_CHECKING
 from .events import BallBallCollision, BallWallCollision, BallGridTransit
+from .wall import pack_walls
 from .physics import (
     calculate_ball_ball_collision_time,
-    calculate_ball_wall_collision_time, 
-    calculate_ball_grid_transit_time
+    calculate_ball_ball_collision_times,
+    calculate_ball_walls_collision_times,
+    calculate_ball_wall_collision_times,
+    calculate_ball_grid_transit_time,
+    calculate_ball_grid_transit_times
 )
 
 if TYPE_CHECKING:
@@ -24,6 +30,7 @@ def generate_ball_ball_events(ball: 'Ball', other_balls: List['Ball'],
         current_time: current simulation time
         ndim: number of dimensions
         gravity: whether gravity is enabled
+        log_events: print a JSON log line per checked pair (default True)
         
     Returns:
         list of BallBallCollision events
@@ -43,17 +50,16 @@ def generate_ball_ball_events(ball: 'Ball', other_balls: List['Ball'],
             event = BallBallCollision(collision_time, ball, other_ball)
             events.append(event)
             
-            import json
-            log_entry = {
-                "event_type": "EventCreated",
-                "created_event": "BallBallCollision", 
-                "time": collision_time,
-                "ball1": ball.index,
-                "ball2": other_ball.index
-            }
-            print(json.dumps(log_entry))
-        else:
-            import json
+            if log_events:
+                log_entry = {
+                    "event_type": "EventCreated",
+                    "created_event": "BallBallCollision", 
+                    "time": collision_time,
+                    "ball1": ball.index,
+                    "ball2": other_ball.index
+                }
+                print(json.dumps(log_entry))
+        elif log_events:
             log_entry = {
                 "event_type": "CollisionCheck",
                 "result": "no_collision",
@@ -66,9 +72,43 @@ def generate_ball_ball_events(ball: 'Ball', other_balls: List['Ball'],
     return events
 
 
+def generate_ball_ball_events_batch(balls: List['Ball'], first: np.ndarray, second: np.ndarray,
+                                    positions: np.ndarray, velocities: np.ndarray,
+                                    times: np.ndarray, radii: np.ndarray,
+                                    current_time: float, gravity: bool = False) -> List[BallBallCollision]:
+    """
+    Generate ball-ball collision events for many candidate pairs in one vectorized pass.
+    
+    Duplicate prevention is the caller's job, as for generate_ball_ball_events:
+    each pair passed in produces at most one event.
+    
+    Args:
+        balls: list of all balls in simulation
+        first: indices of the first ball of each candidate pair
+        second: indices of the second ball of each candidate pair
+        positions: (N, ndim) ball positions at their reference times
+        velocities: (N, ndim) ball velocities at their reference times
+        times: (N,) ball reference times
+        radii: (N,) ball radii
+        current_time: current simulation time
+        gravity: whether gravity is enabled
+        
+    Returns:
+        list of BallBallCollision events, in candidate pair order
+    """
+    collision_times = calculate_ball_ball_collision_times(
+        positions, velocities, times, radii, first, second, current_time, gravity
+    )
+    
+    # Only build event objects for pairs that actually collide
+    hits = np.flatnonzero(np.isfinite(collision_times))
+    return [BallBallCollision(float(collision_times[k]), balls[first[k]], balls[second[k]])
+            for k in hits]
+
+
 def generate_ball_wall_events(ball: 'Ball', walls: List['Wall'],
                              current_time: float, ndim: int,
-                             gravity: bool = False) -> List[BallWallCollision]:
+                             gravity: bool = False, log_events: bool = True) -> List[BallWallCollision]:
     """
     Generate ball-wall collision events for a ball against all walls.
     
@@ -78,36 +118,65 @@ def generate_ball_wall_events(ball: 'Ball', walls: List['Wall'],
         current_time: current simulation time
         ndim: number of dimensions
         gravity: whether gravity is enabled
+        log_events: print a JSON log line per created event (default True)
         
     Returns:
         list of BallWallCollision events
     """
     events = []
     
-    for wall in walls:
-        collision_time = calculate_ball_wall_collision_time(
-            ball, wall, current_time, ndim, gravity
-        )
-        
+    collision_times = calculate_ball_walls_collision_times(ball, walls, current_time, ndim, gravity)
+    for wall, collision_time in zip(walls, collision_times):
         if collision_time is not None:
             event = BallWallCollision(collision_time, ball, wall)
             events.append(event)
             
-            import json
-            log_entry = {
-                "event_type": "EventCreated",
-                "created_event": "BallWallCollision",
-                "time": collision_time,
-                "ball": ball.index,
-                "wall": str(wall)
-            }
-            print(json.dumps(log_entry))
+            if log_events:
+                log_entry = {
+                    "event_type": "EventCreated",
+                    "created_event": "BallWallCollision",
+                    "time": collision_time,
+                    "ball": ball.index,
+                    "wall": str(wall)
+                }
+                print(json.dumps(log_entry))
     
     return events
 
 
+def generate_ball_wall_events_batch(balls: List['Ball'], walls: List['Wall'],
+                                    positions: np.ndarray, velocities: np.ndarray,
+                                    times: np.ndarray, radii: np.ndarray,
+                                    current_time: float, gravity: bool = False) -> List[BallWallCollision]:
+    """
+    Generate ball-wall collision events for many balls against all walls in one vectorized pass.
+    
+    Args:
+        balls: balls to generate events for, matching the rows of the state arrays
+        walls: list of walls to check collisions against
+        positions: (N, ndim) ball positions at their reference times
+        velocities: (N, ndim) ball velocities at their reference times
+        times: (N,) ball reference times
+        radii: (N,) ball radii
+        current_time: current simulation time
+        gravity: whether gravity is enabled
+        
+    Returns:
+        list of BallWallCollision events, ordered by ball and then wall
+    """
+    wall_axes, wall_coordinates, _ = pack_walls(walls)
+    collision_times = calculate_ball_wall_collision_times(
+        positions, velocities, times, radii, wall_axes, wall_coordinates, current_time, gravity
+    )
+    
+    # Only build event objects for (ball, wall) pairs that actually collide
+    hit_balls, hit_walls = np.nonzero(np.isfinite(collision_times))
+    return [BallWallCollision(float(collision_times[k, w]), balls[k], walls[w])
+            for k, w in zip(hit_balls.tolist(), hit_walls.tolist())]
+
+
 def generate_ball_grid_event(ball: 'Ball', current_time: float, ndim: int,
-                            gravity: bool = False) -> List[BallGridTransit]:
+                            gravity: bool = False, log_events: bool = True) -> List[BallGridTransit]:
     """
     Generate ball-grid transit event for when a ball crosses cell boundaries.
     
@@ -116,6 +185,7 @@ def generate_ball_grid_event(ball: 'Ball', current_time: float, ndim: int,
         current_time: current simulation time
         ndim: number of dimensions
         gravity: whether gravity is enabled
+        log_events: print a JSON log line for the created event (default True)
         
     Returns:
         list containing BallGridTransit event (empty if no transit)
@@ -129,23 +199,55 @@ def generate_ball_grid_event(ball: 'Ball', current_time: float, ndim: int,
         event = BallGridTransit(transit_time, ball, new_cell)
         events.append(event)
         
-        import json
-        log_entry = {
-            "event_type": "EventCreated",
-            "created_event": "BallGridTransit",
-            "time": transit_time,
-            "ball": ball.index,
-            "from_cell": ball.cell,
-            "to_cell": new_cell
-        }
-        print(json.dumps(log_entry))
+        if log_events:
+            log_entry = {
+                "event_type": "EventCreated",
+                "created_event": "BallGridTransit",
+                "time": transit_time,
+                "ball": ball.index,
+                "from_cell": ball.cell,
+                "to_cell": new_cell
+            }
+            print(json.dumps(log_entry))
+    
+    return events
+
+
+def generate_ball_grid_events_batch(balls: List['Ball'], positions: np.ndarray,
+                                    velocities: np.ndarray, times: np.ndarray, cells: np.ndarray,
+                                    current_time: float, gravity: bool = False) -> List[BallGridTransit]:
+    """
+    Generate ball-grid transit events for many balls in one vectorized pass.
+    
+    Args:
+        balls: balls to generate events for, matching the rows of the state arrays
+        positions: (N, ndim) ball positions at their reference times
+        velocities: (N, ndim) ball velocities at their reference times
+        times: (N,) ball reference times
+        cells: (N, ndim) current cell indices
+        current_time: current simulation time
+        gravity: whether gravity is enabled
+        
+    Returns:
+        list of BallGridTransit events, in ball order
+    """
+    transit_times, axes, deltas = calculate_ball_grid_transit_times(
+        positions, velocities, times, cells, current_time, 1.0, gravity
+    )
+    
+    events = []
+    for k in np.flatnonzero(np.isfinite(transit_times)).tolist():
+        cell = balls[k].cell
+        axis = int(axes[k])
+        new_cell = cell[:axis] + (cell[axis] + int(deltas[k]),) + cell[axis + 1:]
+        events.append(BallGridTransit(float(transit_times[k]), balls[k], new_cell))
     
     return events
 
 
 def generate_events_for_ball(ball: 'Ball', balls: List['Ball'], walls: List['Wall'],
                            grid: 'Grid', current_time: float, ndim: int,
-                           gravity: bool = False) -> List:
+                           gravity: bool = False, log_events: bool = True) -> List:
     """
     Generate all events (ball-ball, ball-wall, ball-grid) for a single ball.
     
@@ -157,6 +259,7 @@ def generate_events_for_ball(ball: 'Ball', balls: List['Ball'], walls: List['Wal
         current_time: current simulation time
         ndim: number of dimensions
         gravity: whether gravity is enabled
+        log_events: print JSON log lines for generation and created events (default True)
         
     Returns:
         list of all events involving this ball
@@ -167,36 +270,36 @@ def generate_events_for_ball(ball: 'Ball', balls: List['Ball'], walls: List['Wal
     neighbor_ball_indices = grid.get_balls_in_neighboring_cells(ball.cell)
     neighbor_balls = [balls[i] for i in neighbor_ball_indices]
     
-    # Generate neighbor cell info for JSON log
-    neighbor_cells_info = {}
-    if ndim == 2:
-        for di in [-1, 0, 1]:
-            for dj in [-1, 0, 1]:
-                neighbor_cell = (ball.cell[0] + di, ball.cell[1] + dj)
-                if (0 <= neighbor_cell[0] < grid.num_cells[0] and 
-                    0 <= neighbor_cell[1] < grid.num_cells[1]):
-                    balls_in_cell = grid.cells[neighbor_cell[0]][neighbor_cell[1]]
-                    neighbor_cells_info[str(neighbor_cell)] = balls_in_cell
-                else:
-                    neighbor_cells_info[str(neighbor_cell)] = "OUT_OF_BOUNDS"
-    
-    import json
-    log_entry = {
-        "event_type": "EventGeneration",
-        "ball": ball.index,
-        "cell": ball.cell,
-        "current_time": current_time,
-        "neighbor_cells": neighbor_cells_info,
-        "neighbor_balls": [b.index for b in neighbor_balls]
-    }
-    print(json.dumps(log_entry))
-    events.extend(generate_ball_ball_events(ball, neighbor_balls, current_time, ndim, gravity))
+    if log_events:
+        # Generate neighbor cell info for JSON log
+        neighbor_cells_info = {}
+        if ndim == 2:
+            for di in [-1, 0, 1]:
+                for dj in [-1, 0, 1]:
+                    neighbor_cell = (ball.cell[0] + di, ball.cell[1] + dj)
+                    if (0 <= neighbor_cell[0] < grid.num_cells[0] and 
+                        0 <= neighbor_cell[1] < grid.num_cells[1]):
+                        balls_in_cell = grid.cells[neighbor_cell[0]][neighbor_cell[1]]
+                        neighbor_cells_info[str(neighbor_cell)] = balls_in_cell
+                    else:
+                        neighbor_cells_info[str(neighbor_cell)] = "OUT_OF_BOUNDS"
+        
+        log_entry = {
+            "event_type": "EventGeneration",
+            "ball": ball.index,
+            "cell": ball.cell,
+            "current_time": current_time,
+            "neighbor_cells": neighbor_cells_info,
+            "neighbor_balls": [b.index for b in neighbor_balls]
+        }
+        print(json.dumps(log_entry))
+    events.extend(generate_ball_ball_events(ball, neighbor_balls, current_time, ndim, gravity, log_events))
     
     # Ball-wall events
-    events.extend(generate_ball_wall_events(ball, walls, current_time, ndim, gravity))
+    events.extend(generate_ball_wall_events(ball, walls, current_time, ndim, gravity, log_events))
     
     # Ball-grid transit event
-    events.extend(generate_ball_grid_event(ball, current_time, ndim, gravity))
+    events.extend(generate_ball_grid_event(ball, current_time, ndim, gravity, log_events))
     
     return events
 
@@ -204,7 +307,7 @@ def generate_events_for_ball(ball: 'Ball', balls: List['Ball'], walls: List['Wal
 def generate_ball_ball_events_for_new_cell(ball: 'Ball', old_cell: tuple, 
                                           balls: List['Ball'], grid: 'Grid',
                                           current_time: float, ndim: int,
-                                          gravity: bool = False) -> List[BallBallCollision]:
+                                          gravity: bool = False, log_events: bool = True) -> List[BallBallCollision]:
     """
     Generate ball-ball collision events for newly adjacent cells after grid transit.
     
@@ -216,6 +319,7 @@ def generate_ball_ball_events_for_new_cell(ball: 'Ball', old_cell: tuple,
         current_time: current simulation time
         ndim: number of dimensions
         gravity: whether gravity is enabled
+        log_events: print a JSON log line per checked pair (default True)
         
     Returns:
         list of BallBallCollision events with balls in newly adjacent cells
@@ -225,4 +329,4 @@ def generate_ball_ball_events_for_new_cell(ball: 'Ball', old_cell: tuple,
     new_neighbor_balls = [balls[i] for i in new_neighbor_indices]
     
     # Generate collision events with these newly adjacent balls
-    return generate_ball_ball_events(ball, new_neighbor_balls, current_time, ndim, gravity)
\ No newline at end of file
+    return generate_ball_ball_events(ball, new_neighbor_balls, current_time, ndim, gravity, log_events)
\ No newline at end of file
@@ -1,5 +1,7 @@
 import heapq
-from typing import Optional, TYPE_CHECKING
+import json
+from typing import List, Optional, TYPE_CHECKING
+from .events import KIND_BALL_BALL, KIND_BALL_WALL, KIND_GRID
 
 if TYPE_CHECKING:
     from .events import Event
@@ -10,11 +12,22 @@ class EventHeap:
     Priority queue for simulation events, ordered by event time.
     
     Automatically discards invalid events when retrieving next event.
+    
+    Entries are stored as (time, sequence, event) tuples so the heap compares
+    floats directly; the sequence number breaks ties in insertion order and
+    keeps Event.__lt__ out of the sift loop.
+    
+    Invalidated events stay in the heap until popped. Once callers report
+    (via note_invalidated) that more than half the heap may be invalid, the
+    heap is compacted in one O(n) pass so pops stay O(log n).
     """
     
     def __init__(self):
         """Initialize empty event heap."""
         self._heap = []
+        self._sequence = 0
+        self._invalid_count = 0
+        self._last_time = 0.0  # time of the most recently popped entry
     
     def add_event(self, event: 'Event'):
         """
@@ -23,7 +36,24 @@ class EventHeap:
         Args:
             event: Event to add
         """
-        heapq.heappush(self._heap, event)
+        heapq.heappush(self._heap, (event.time, self._sequence, event))
+        self._sequence += 1
+    
+    def heapify(self, events: List['Event']):
+        """
+        Add many events at once.
+        
+        Rebuilds the heap in O(n) instead of pushing events one at a time.
+        
+        Args:
+            events: Events to add
+        """
+        start = self._sequence
+        self._heap.extend(
+            (event.time, start + offset, event) for offset, event in enumerate(events)
+        )
+        self._sequence = start + len(events)
+        heapq.heapify(self._heap)
     
     def get_next_event(self) -> Optional['Event']:
         """
@@ -35,43 +65,75 @@ class EventHeap:
             Next valid event, or None if heap is empty
         """
         while self._heap:
-            event = heapq.heappop(self._heap)
+            if self._invalid_count > len(self._heap) // 2:
+                self._compact()
+                continue
+            self._last_time, _, event = heapq.heappop(self._heap)
             if event.valid:
                 return event
             # Invalid event - discard and continue
-            import json
-            discard_log = {
-                "event_type": "EventDiscarded",
-                "time": event.time,
-                "discarded_event": str(event),
-                "reason": "invalid"
-            }
-            
-            # Add ball information based on event type
-            if hasattr(event, 'ball1') and hasattr(event, 'ball2'):
-                # BallBallCollision
-                discard_log["ball1"] = event.ball1.index
-                discard_log["ball2"] = event.ball2.index
-                discard_log["event_subtype"] = "BallBallCollision"
-            elif hasattr(event, 'ball') and hasattr(event, 'wall'):
-                # BallWallCollision
-                discard_log["ball"] = event.ball.index
-                discard_log["wall"] = str(event.wall)
-                discard_log["event_subtype"] = "BallWallCollision"
-            elif hasattr(event, 'ball') and hasattr(event, 'new_cell'):
-                # BallGridTransit
-                discard_log["ball"] = event.ball.index
-                discard_log["from_cell"] = list(event.ball.cell)
-                discard_log["to_cell"] = list(event.new_cell)
-                discard_log["event_subtype"] = "BallGridTransit"
-            elif hasattr(event, 'ball'):
-                # Other ball events
-                discard_log["ball"] = event.ball.index
-                
-            print(json.dumps(discard_log))
+            self._log_discarded(event)
         
         return None
     
+    def note_invalidated(self, count: int):
+        """
+        Record that up to `count` queued events were just invalidated.
+        
+        The count is an upper bound (an event shared by two balls is counted
+        once per ball); it only decides when the heap is worth compacting.
+        
+        Args:
+            count: number of events invalidated
+        """
+        self._invalid_count += count
+    
+    def _compact(self):
+        """
+        Drop all invalid entries at once and rebuild the heap in O(n).
+        
+        Compacted entries produce no EventDiscarded line. A single HeapCompacted line
+        with the number of dropped entries is logged instead, stamped with the time of
+        the last popped event so the log stays in time order.
+        """
+        kept = [entry for entry in self._heap if entry[2].valid]
+        print(json.dumps({
+            "event_type": "HeapCompacted",
+            "time": self._last_time,
+            "discarded": len(self._heap) - len(kept)
+        }))
+        heapq.heapify(kept)
+        self._heap = kept
+        self._invalid_count = 0
+    
+    @staticmethod
+    def _log_discarded(event: 'Event'):
+        """Print the JSON log line for an invalid event removed from the heap."""
+        discard_log = {
+            "event_type": "EventDiscarded",
+            "time": event.time,
+            "discarded_event": str(event),
+            "reason": "invalid"
+        }
+        
+        # Add ball information based on the event kind tag
+        kind = event.KIND
+        if kind == KIND_BALL_BALL:
+            discard_log["ball1"] = event.ball1.index
+            discard_log["ball2"] = event.ball2.index
+            discard_log["event_subtype"] = "BallBallCollision"
+        elif kind == KIND_BALL_WALL:
+            discard_log["ball"] = event.ball.index
+            discard_log["wall"] = str(event.wall)
+            discard_log["event_subtype"] = "BallWallCollision"
+        elif kind == KIND_GRID:
+            discard_log["ball"] = event.ball.index
+            discard_log["from_cell"] = list(event.ball.cell)
+            discard_log["to_cell"] = list(event.new_cell)
+            discard_log["event_subtype"] = "BallGridTransit"
+            
+        print(json.dumps(discard_log))
+    
     def is_empty(self) -> bool:
         """
         Check if heap is empty.
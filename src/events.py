@@ -1,14 +1,44 @@
+import json
 from abc import ABC, abstractmethod
 from typing import List, Union, TYPE_CHECKING
+from .ball import BallState
+from .physics import perform_ball_ball_collision, perform_ball_wall_collision, find_overlapping_pair
 
 if TYPE_CHECKING:
     from .ball import Ball
     from .wall import Wall
 
 
+# Integer event kind tags, exposed on each event class as KIND
+KIND_BALL_BALL = 0
+KIND_BALL_WALL = 1
+KIND_GRID = 2
+KIND_EXPORT = 3
+KIND_END = 4
+
+
+def _describe_new_event(event: 'Event') -> dict:
+    """Summarize a newly generated event for a processing log, dispatching on its kind tag."""
+    event_info = {"type": event.__class__.__name__, "time": event.time}
+    kind = event.KIND
+    if kind == KIND_BALL_BALL:
+        event_info["ball1"] = event.ball1.index
+        event_info["ball2"] = event.ball2.index
+    elif kind == KIND_BALL_WALL:
+        event_info["ball"] = event.ball.index
+        event_info["wall"] = str(event.wall)
+    elif kind == KIND_GRID:
+        event_info["ball"] = event.ball.index
+        event_info["new_cell"] = list(event.new_cell)
+    return event_info
+
+
 class Event(ABC):
     """Base class for all simulation events."""
     
+    # Events are created per collision; slots keep them small and attribute access fast
+    __slots__ = ('time', '_valid', '_balls', '_versions')
+    
     def __init__(self, time: float):
         """
         Initialize event.
@@ -17,7 +47,30 @@ class Event(ABC):
             time: time when event occurs
         """
         self.time = time
-        self.valid = True
+        self._valid = True
+        self._balls = ()
+        self._versions = ()
+    
+    def _snapshot_versions(self, *balls: 'Ball'):
+        """Record the current version of each participating ball."""
+        self._balls = balls
+        self._versions = tuple(ball.version for ball in balls)
+    
+    def is_stale(self) -> bool:
+        """Check whether any participating ball has changed trajectory since this event was created."""
+        for ball, version in zip(self._balls, self._versions):
+            if ball.version != version:
+                return True
+        return False
+    
+    @property
+    def valid(self) -> bool:
+        """Event is valid unless explicitly invalidated or made stale by a participant."""
+        return self._valid and not self.is_stale()
+    
+    @valid.setter
+    def valid(self, value: bool):
+        self._valid = value
     
     @abstractmethod
     def get_participants(self) -> List[Union['Ball', 'Wall']]:
@@ -40,6 +93,9 @@ class Event(ABC):
 class BallBallCollision(Event):
     """Event for collision between two balls."""
     
+    KIND = KIND_BALL_BALL
+    __slots__ = ('ball1', 'ball2')
+    
     def __init__(self, time: float, ball1: 'Ball', ball2: 'Ball'):
         """
         Initialize ball-ball collision event.
@@ -52,6 +108,7 @@ class BallBallCollision(Event):
         super().__init__(time)
         self.ball1 = ball1
         self.ball2 = ball2
+        self._snapshot_versions(ball1, ball2)
         
         # Add this event to both balls' event lists
         ball1.add_event(self)
@@ -74,15 +131,11 @@ class BallBallCollision(Event):
             grid: the spatial grid
             event_heap: heap to add new events to
         """
-        from .physics import perform_ball_ball_collision
-        
         ndim = kwargs['ndim']
         gravity = kwargs['gravity']
         ball_restitution = kwargs['ball_restitution']
         event_heap = kwargs['event_heap']
         
-        import json
-        
         log_entry = {
             "event_type": "BallBallCollision",
             "time": self.time,
@@ -125,6 +178,7 @@ class BallBallCollision(Event):
         events2 = len(self.ball2.events)
         self.ball1.invalidate_all_events()
         self.ball2.invalidate_all_events()
+        event_heap.note_invalidated(events1 + events2)
         
         log_entry["events_invalidated"] = {
             "ball1": events1,
@@ -138,30 +192,13 @@ class BallBallCollision(Event):
         grid = kwargs['grid']
         
         # Generate new events for both balls (suppress individual event logging)
-        import sys, io
-        original_stdout = sys.stdout
-        sys.stdout = io.StringIO()
-        
-        new_events = generate_events_for_ball(self.ball1, balls, walls, grid, self.time, ndim, gravity)
-        new_events.extend(generate_events_for_ball(self.ball2, balls, walls, grid, self.time, ndim, gravity))
-        
-        # Restore stdout
-        sys.stdout = original_stdout
+        new_events = generate_events_for_ball(self.ball1, balls, walls, grid, self.time, ndim, gravity,
+                                              log_events=False)
+        new_events.extend(generate_events_for_ball(self.ball2, balls, walls, grid, self.time, ndim, gravity,
+                                                   log_events=False))
         
         # Add event generation summary to collision log with detailed event info
-        event_details = []
-        for event in new_events:
-            event_info = {"type": event.__class__.__name__, "time": event.time}
-            if hasattr(event, 'ball1') and hasattr(event, 'ball2'):
-                event_info["ball1"] = event.ball1.index
-                event_info["ball2"] = event.ball2.index
-            elif hasattr(event, 'ball'):
-                event_info["ball"] = event.ball.index
-                if hasattr(event, 'wall'):
-                    event_info["wall"] = str(event.wall)
-                elif hasattr(event, 'new_cell'):
-                    event_info["new_cell"] = list(event.new_cell)
-            event_details.append(event_info)
+        event_details = [_describe_new_event(event) for event in new_events]
         
         log_entry["new_events_generated"] = {
             "count": len(new_events),
@@ -179,6 +216,9 @@ class BallBallCollision(Event):
 class BallWallCollision(Event):
     """Event for collision between a ball and a wall."""
     
+    KIND = KIND_BALL_WALL
+    __slots__ = ('ball', 'wall')
+    
     def __init__(self, time: float, ball: 'Ball', wall: 'Wall'):
         """
         Initialize ball-wall collision event.
@@ -191,6 +231,7 @@ class BallWallCollision(Event):
         super().__init__(time)
         self.ball = ball
         self.wall = wall
+        self._snapshot_versions(ball)
         
         # Add this event to ball's event list
         ball.add_event(self)
@@ -212,15 +253,11 @@ class BallWallCollision(Event):
             grid: the spatial grid
             event_heap: heap to add new events to
         """
-        from .physics import perform_ball_wall_collision
-        
         ndim = kwargs['ndim']
         gravity = kwargs['gravity']
         wall_restitution = kwargs['wall_restitution']
         event_heap = kwargs['event_heap']
         
-        import json
-        
         log_entry = {
             "event_type": "BallWallCollision",
             "time": self.time,
@@ -245,6 +282,7 @@ class BallWallCollision(Event):
         # Invalidate all events for the ball (velocity changed)
         events_invalidated = len(self.ball.events)
         self.ball.invalidate_all_events()
+        event_heap.note_invalidated(events_invalidated)
         log_entry["events_invalidated"] = events_invalidated
         
         # Generate new events for the ball (suppress individual event logging)
@@ -254,29 +292,11 @@ class BallWallCollision(Event):
         grid = kwargs['grid']
         
         # Suppress individual event generation logging during collision processing
-        import sys, io
-        original_stdout = sys.stdout
-        sys.stdout = io.StringIO()
-        
-        new_events = generate_events_for_ball(self.ball, balls, walls, grid, self.time, ndim, gravity)
-        
-        # Restore stdout
-        sys.stdout = original_stdout
+        new_events = generate_events_for_ball(self.ball, balls, walls, grid, self.time, ndim, gravity,
+                                              log_events=False)
         
         # Add event generation summary to collision log with detailed event info
-        event_details = []
-        for event in new_events:
-            event_info = {"type": event.__class__.__name__, "time": event.time}
-            if hasattr(event, 'ball1') and hasattr(event, 'ball2'):
-                event_info["ball1"] = event.ball1.index
-                event_info["ball2"] = event.ball2.index
-            elif hasattr(event, 'ball'):
-                event_info["ball"] = event.ball.index
-                if hasattr(event, 'wall'):
-                    event_info["wall"] = str(event.wall)
-                elif hasattr(event, 'new_cell'):
-                    event_info["new_cell"] = list(event.new_cell)
-            event_details.append(event_info)
+        event_details = [_describe_new_event(event) for event in new_events]
         
         log_entry["new_events_generated"] = {
             "count": len(new_events),
@@ -294,6 +314,9 @@ class BallWallCollision(Event):
 class BallGridTransit(Event):
     """Event for ball moving from one grid cell to another."""
     
+    KIND = KIND_GRID
+    __slots__ = ('ball', 'new_cell')
+    
     def __init__(self, time: float, ball: 'Ball', new_cell: tuple):
         """
         Initialize ball grid transit event.
@@ -306,6 +329,7 @@ class BallGridTransit(Event):
         super().__init__(time)
         self.ball = ball
         self.new_cell = new_cell
+        self._snapshot_versions(ball)
         
         # Add this event to ball's event list
         ball.add_event(self)
@@ -328,8 +352,6 @@ class BallGridTransit(Event):
         grid = kwargs['grid']
         event_heap = kwargs['event_heap']
         
-        import json
-        
         log_entry = {
             "event_type": "BallGridTransit", 
             "time": self.time,
@@ -345,7 +367,7 @@ class BallGridTransit(Event):
         
         # Update ball's cell (position/velocity/time unchanged)
         old_cell = self.ball.cell
-        self.ball.cell = self.new_cell
+        self.ball.set_cell(self.new_cell)
         
         # Update grid cell memberships
         grid.move_ball(self.ball.index, old_cell, self.new_cell)
@@ -358,33 +380,15 @@ class BallGridTransit(Event):
         current_time = self.time  # Use event time as current time
         
         # Generate new events (suppress individual event logging)
-        import sys, io
-        original_stdout = sys.stdout
-        sys.stdout = io.StringIO()
-        
-        new_events = generate_ball_ball_events_for_new_cell(self.ball, old_cell, balls, grid, current_time, ndim, gravity)
+        new_events = generate_ball_ball_events_for_new_cell(self.ball, old_cell, balls, grid, current_time, ndim, gravity,
+                                                            log_events=False)
         
         # Generate new ball-grid transit event for continued movement in new cell
-        grid_events = generate_ball_grid_event(self.ball, current_time, ndim, gravity)
+        grid_events = generate_ball_grid_event(self.ball, current_time, ndim, gravity, log_events=False)
         new_events.extend(grid_events)
         
-        # Restore stdout
-        sys.stdout = original_stdout
-        
         # Add event generation summary to transit log with detailed event info
-        event_details = []
-        for event in new_events:
-            event_info = {"type": event.__class__.__name__, "time": event.time}
-            if hasattr(event, 'ball1') and hasattr(event, 'ball2'):
-                event_info["ball1"] = event.ball1.index
-                event_info["ball2"] = event.ball2.index
-            elif hasattr(event, 'ball'):
-                event_info["ball"] = event.ball.index
-                if hasattr(event, 'wall'):
-                    event_info["wall"] = str(event.wall)
-                elif hasattr(event, 'new_cell'):
-                    event_info["new_cell"] = list(event.new_cell)
-            event_details.append(event_info)
+        event_details = [_describe_new_event(event) for event in new_events]
         
         log_entry["new_events_generated"] = {
             "ball_ball_events": len(new_events) - len(grid_events),
@@ -404,6 +408,9 @@ class BallGridTransit(Event):
 class ExportEvent(Event):
     """Event for outputting simulation state to file."""
     
+    KIND = KIND_EXPORT
+    __slots__ = ()
+    
     def __init__(self, time: float):
         """
         Initialize export event.
@@ -426,46 +433,41 @@ class ExportEvent(Event):
             output_manager: object to handle file output
             ndim: number of dimensions
             gravity: whether gravity is enabled
+        
+        Optional kwargs:
+            ball_state: shared BallState the balls are bound to; gathered from the
+                balls when not given
         """
         balls = kwargs['balls']
         output_manager = kwargs['output_manager']
         ndim = kwargs['ndim']
         gravity = kwargs['gravity']
+        state = kwargs.get('ball_state')
+        if state is None:
+            state = BallState.from_balls(balls)
         
         # Calculate current positions and velocities for all balls without updating them
-        current_positions = []
-        current_velocities = []
-        
-        for ball in balls:
-            pos, vel = ball.get_position_and_velocity_at_time(self.time, ndim, gravity)
-            current_positions.append(pos)
-            current_velocities.append(vel)
+        current_positions, current_velocities = state.at_time(self.time, ndim, gravity)
         
         # Check for overlapping balls
-        import numpy as np
-        import math
-        for i in range(len(balls)):
-            for j in range(i + 1, len(balls)):
-                ball_i = balls[i]
-                ball_j = balls[j]
-                pos_i = current_positions[i]
-                pos_j = current_positions[j]
-                
-                # Calculate distance between ball centers
-                distance_vec = pos_j - pos_i
-                distance = math.sqrt(np.dot(distance_vec, distance_vec))
-                min_distance = ball_i.radius + ball_j.radius
-                
-                if distance < min_distance:
-                    error_msg = f"OVERLAP DETECTED at t={self.time:.6f}: Ball {ball_i.index} and Ball {ball_j.index}"
-                    error_msg += f"\n  Ball {ball_i.index}: position={pos_i}, radius={ball_i.radius}"
-                    error_msg += f"\n  Ball {ball_j.index}: position={pos_j}, radius={ball_j.radius}"
-                    error_msg += f"\n  Distance={distance:.6f}, Min distance={min_distance:.6f}"
-                    error_msg += f"\n  Overlap amount={min_distance - distance:.6f}"
-                    print(error_msg)
-                    
-                    # Kill the simulation
-                    raise RuntimeError(f"Ball overlap detected: {error_msg}")
+        overlap = find_overlapping_pair(current_positions, state.radii)
+        if overlap is not None:
+            i, j, distance = overlap
+            ball_i = balls[i]
+            ball_j = balls[j]
+            pos_i = current_positions[i]
+            pos_j = current_positions[j]
+            min_distance = ball_i.radius + ball_j.radius
+            
+            error_msg = f"OVERLAP DETECTED at t={self.time:.6f}: Ball {ball_i.index} and Ball {ball_j.index}"
+            error_msg += f"\n  Ball {ball_i.index}: position={pos_i}, radius={ball_i.radius}"
+            error_msg += f"\n  Ball {ball_j.index}: position={pos_j}, radius={ball_j.radius}"
+            error_msg += f"\n  Distance={distance:.6f}, Min distance={min_distance:.6f}"
+            error_msg += f"\n  Overlap amount={min_distance - distance:.6f}"
+            print(error_msg)
+            
+            # Kill the simulation
+            raise RuntimeError(f"Ball overlap detected: {error_msg}")
         
         # Write to output
         output_manager.write_frame(self.time, current_positions, current_velocities)
@@ -474,6 +476,9 @@ class ExportEvent(Event):
 class EndEvent(Event):
     """Event to signal simulation end."""
     
+    KIND = KIND_END
+    __slots__ = ()
+    
     def __init__(self, time: float):
         """
         Initialize end event.
@@ -25,14 +25,18 @@ class Grid:
         # Calculate number of cells in each dimension
         self.num_cells = tuple(int(np.ceil(size)) for size in self.domain_size)
         
-        # Create grid as nested lists - each cell contains list of ball indices
+        # One list of ball indices per cell, stored flat by linear (row-major) cell index
+        total_cells = int(np.prod(self.num_cells))
+        self._buckets = [[] for _ in range(total_cells)]
+        
+        # Nested view over the same lists, indexed as cells[i][j] or cells[i][j][k]
         if ndim == 2:
-            self.cells = [[[] for _ in range(self.num_cells[1])] 
-                         for _ in range(self.num_cells[0])]
+            ny = self.num_cells[1]
+            self.cells = [self._buckets[i * ny:(i + 1) * ny] for i in range(self.num_cells[0])]
         elif ndim == 3:
-            self.cells = [[[[] for _ in range(self.num_cells[2])] 
-                          for _ in range(self.num_cells[1])]
-                         for _ in range(self.num_cells[0])]
+            ny, nz = self.num_cells[1], self.num_cells[2]
+            self.cells = [[self._buckets[(i * ny + j) * nz:(i * ny + j + 1) * nz] for j in range(ny)]
+                          for i in range(self.num_cells[0])]
         else:
             raise ValueError(f"Unsupported number of dimensions: {ndim}")
     
@@ -54,100 +58,173 @@ class Grid:
             cell_coords.append(cell_coord)
         return tuple(cell_coords)
     
+    def linear_index(self, cell: Tuple[int, ...]) -> int:
+        """Row-major linear index of a cell: i*ny + j in 2D, (i*ny + j)*nz + k in 3D."""
+        if self.ndim == 2:
+            return cell[0] * self.num_cells[1] + cell[1]
+        return (cell[0] * self.num_cells[1] + cell[1]) * self.num_cells[2] + cell[2]
+    
+    def cell_from_linear(self, index: int) -> Tuple[int, ...]:
+        """Cell coordinates of a row-major linear index (inverse of linear_index)."""
+        if self.ndim == 2:
+            i, j = divmod(index, self.num_cells[1])
+            return (i, j)
+        ij, k = divmod(index, self.num_cells[2])
+        i, j = divmod(ij, self.num_cells[1])
+        return (i, j, k)
+    
     def add_ball(self, ball_index: int, cell: Tuple[int, ...]):
         """Add ball to specified cell."""
-        if self.ndim == 2:
-            self.cells[cell[0]][cell[1]].append(ball_index)
-        elif self.ndim == 3:
-            self.cells[cell[0]][cell[1]][cell[2]].append(ball_index)
+        self._buckets[self.linear_index(cell)].append(ball_index)
+    
+    def add_balls(self, ball_indices: np.ndarray, cells: np.ndarray):
+        """
+        Add many balls at once.
+        
+        Balls are grouped by cell with one sort, so each occupied cell list is
+        extended once; within a cell, balls keep the order they were given in.
+        
+        Args:
+            ball_indices: (N,) ball indices
+            cells: (N, ndim) cell indices of each ball
+        """
+        keys = np.ravel_multi_index(np.asarray(cells).T, self.num_cells)
+        order = np.argsort(keys, kind='stable')
+        occupied, starts = np.unique(keys[order], return_index=True)
+        groups = np.split(np.asarray(ball_indices)[order], starts[1:])
+        
+        buckets = self._buckets
+        for key, group in zip(occupied.tolist(), groups):
+            buckets[key].extend(group.tolist())
     
     def remove_ball(self, ball_index: int, cell: Tuple[int, ...]):
         """Remove ball from specified cell."""
-        if self.ndim == 2:
-            self.cells[cell[0]][cell[1]].remove(ball_index)
-        elif self.ndim == 3:
-            self.cells[cell[0]][cell[1]][cell[2]].remove(ball_index)
+        self._buckets[self.linear_index(cell)].remove(ball_index)
     
     def move_ball(self, ball_index: int, old_cell: Tuple[int, ...], new_cell: Tuple[int, ...]):
         """Move ball from old cell to new cell."""
-        self.remove_ball(ball_index, old_cell)
-        self.add_ball(ball_index, new_cell)
+        buckets = self._buckets
+        buckets[self.linear_index(old_cell)].remove(ball_index)
+        buckets[self.linear_index(new_cell)].append(ball_index)
     
     def get_balls_in_neighboring_cells(self, cell: Tuple[int, ...]) -> List[int]:
         """Get all ball indices in neighboring cells (including the cell itself)."""
         ball_indices = []
+        buckets = self._buckets
         
+        # Clip the 3-cell window on each axis to the grid instead of bounds-checking every neighbor
         if self.ndim == 2:
-            for di in [-1, 0, 1]:
-                for dj in [-1, 0, 1]:
-                    neighbor = (cell[0] + di, cell[1] + dj)
-                    if self._is_valid_cell(neighbor):
-                        if self.ndim == 2:
-                            ball_indices.extend(self.cells[neighbor[0]][neighbor[1]])
+            nx, ny = self.num_cells
+            ys = self._window(cell[1], ny)
+            for i in self._window(cell[0], nx):
+                row = i * ny
+                for j in ys:
+                    ball_indices.extend(buckets[row + j])
         elif self.ndim == 3:
-            for di in [-1, 0, 1]:
-                for dj in [-1, 0, 1]:
-                    for dk in [-1, 0, 1]:
-                        neighbor = (cell[0] + di, cell[1] + dj, cell[2] + dk)
-                        if self._is_valid_cell(neighbor):
-                            ball_indices.extend(self.cells[neighbor[0]][neighbor[1]][neighbor[2]])
+            nx, ny, nz = self.num_cells
+            ys = self._window(cell[1], ny)
+            zs = self._window(cell[2], nz)
+            for i in self._window(cell[0], nx):
+                for j in ys:
+                    row = (i * ny + j) * nz
+                    for k in zs:
+                        ball_indices.extend(buckets[row + k])
         
         return ball_indices
     
+    def candidate_pairs(self, cells: np.ndarray) -> np.ndarray:
+        """
+        Find all pairs of balls in the same or neighboring cells in one vectorized pass.
+        
+        Balls are bucketed by linear cell index; each ball then looks up the bucket of
+        every neighboring cell (including its own) and keeps partners with a higher
+        index, so each unordered pair appears exactly once.
+        
+        Args:
+            cells: (N, ndim) cell indices of each ball (row i is ball i)
+            
+        Returns:
+            (M, 2) int32 array of (i, j) pairs with i < j, sorted by i then j
+        """
+        keys = np.ravel_multi_index(cells.T, self.num_cells)
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        
+        first = []
+        second = []
+        offsets = np.stack(np.meshgrid(*[[-1, 0, 1]] * self.ndim, indexing='ij'), axis=-1).reshape(-1, self.ndim)
+        for offset in offsets:
+            neighbor_cells = cells + offset
+            inside = np.all((neighbor_cells >= 0) & (neighbor_cells < self.num_cells), axis=1)
+            balls = np.flatnonzero(inside)
+            neighbor_keys = np.ravel_multi_index(neighbor_cells[balls].T, self.num_cells)
+            
+            # Range of each neighboring bucket in the sorted order
+            start = np.searchsorted(sorted_keys, neighbor_keys, side='left')
+            counts = np.searchsorted(sorted_keys, neighbor_keys, side='right') - start
+            
+            # Expand every (ball, bucket) range into individual pairs
+            i = np.repeat(balls, counts)
+            within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            j = order[np.repeat(start, counts) + within]
+            
+            keep = j > i
+            first.append(i[keep])
+            second.append(j[keep])
+        
+        pairs = np.stack([np.concatenate(first), np.concatenate(second)], axis=1).astype(np.int32)
+        return pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+    
     def get_balls_in_new_neighbor_cells(self, old_cell: Tuple[int, ...], new_cell: Tuple[int, ...]) -> List[int]:
         """Get ball indices in newly adjacent cells when moving from old_cell to new_cell."""
         # Calculate movement direction
         movement = tuple(new_cell[i] - old_cell[i] for i in range(self.ndim))
         
         ball_indices = []
+        buckets = self._buckets
         
         if self.ndim == 2:
             # In 2D, there are 3 newly adjacent cells in the direction of movement
+            nx, ny = self.num_cells
             if movement[0] != 0:  # Moving in x direction
                 x_new = new_cell[0] + movement[0]
-                for dy in [-1, 0, 1]:
-                    neighbor = (x_new, new_cell[1] + dy)
-                    if self._is_valid_cell(neighbor):
-                        ball_indices.extend(self.cells[neighbor[0]][neighbor[1]])
+                if 0 <= x_new < nx:
+                    for y in self._window(new_cell[1], ny):
+                        ball_indices.extend(buckets[x_new * ny + y])
             
             if movement[1] != 0:  # Moving in y direction
                 y_new = new_cell[1] + movement[1]
-                for dx in [-1, 0, 1]:
-                    neighbor = (new_cell[0] + dx, y_new)
-                    if self._is_valid_cell(neighbor):
-                        ball_indices.extend(self.cells[neighbor[0]][neighbor[1]])
+                if 0 <= y_new < ny:
+                    for x in self._window(new_cell[0], nx):
+                        ball_indices.extend(buckets[x * ny + y_new])
         
         elif self.ndim == 3:
             # In 3D, there are 9 newly adjacent cells in the plane of movement
+            nx, ny, nz = self.num_cells
             if movement[0] != 0:  # Moving in x direction
                 x_new = new_cell[0] + movement[0]
-                for dy in [-1, 0, 1]:
-                    for dz in [-1, 0, 1]:
-                        neighbor = (x_new, new_cell[1] + dy, new_cell[2] + dz)
-                        if self._is_valid_cell(neighbor):
-                            ball_indices.extend(self.cells[neighbor[0]][neighbor[1]][neighbor[2]])
+                if 0 <= x_new < nx:
+                    for y in self._window(new_cell[1], ny):
+                        for z in self._window(new_cell[2], nz):
+                            ball_indices.extend(buckets[(x_new * ny + y) * nz + z])
             
             if movement[1] != 0:  # Moving in y direction
                 y_new = new_cell[1] + movement[1]
-                for dx in [-1, 0, 1]:
-                    for dz in [-1, 0, 1]:
-                        neighbor = (new_cell[0] + dx, y_new, new_cell[2] + dz)
-                        if self._is_valid_cell(neighbor):
-                            ball_indices.extend(self.cells[neighbor[0]][neighbor[1]][neighbor[2]])
+                if 0 <= y_new < ny:
+                    for x in self._window(new_cell[0], nx):
+                        for z in self._window(new_cell[2], nz):
+                            ball_indices.extend(buckets[(x * ny + y_new) * nz + z])
             
             if movement[2] != 0:  # Moving in z direction
                 z_new = new_cell[2] + movement[2]
-                for dx in [-1, 0, 1]:
-                    for dy in [-1, 0, 1]:
-                        neighbor = (new_cell[0] + dx, new_cell[1] + dy, z_new)
-                        if self._is_valid_cell(neighbor):
-                            ball_indices.extend(self.cells[neighbor[0]][neighbor[1]][neighbor[2]])
+                if 0 <= z_new < nz:
+                    for x in self._window(new_cell[0], nx):
+                        for y in self._window(new_cell[1], ny):
+                            ball_indices.extend(buckets[(x * ny + y) * nz + z_new])
         
         return ball_indices
     
-    def _is_valid_cell(self, cell: Tuple[int, ...]) -> bool:
-        """Check if cell coordinates are valid."""
-        for i in range(self.ndim):
-            if cell[i] < 0 or cell[i] >= self.num_cells[i]:
-                return False
-        return True
\ No newline at end of file
+    @staticmethod
+    def _window(coord: int, num_cells: int) -> range:
+        """Cell coordinates within one cell of coord along an axis, clipped to the grid."""
+        return range(max(coord - 1, 0), min(coord + 2, num_cells))
@@ -1,6 +1,6 @@
 import numpy as np
 import math
-from typing import Optional, TYPE_CHECKING
+from typing import List, Optional, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .ball import Ball
@@ -32,28 +32,35 @@ def calculate_ball_ball_collision_time(ball1: 'Ball', ball2: 'Ball',
     x1, v1, t1 = ball2.position, ball2.velocity, ball2.time
     r = ball1.radius + ball2.radius
     
+    # Work on Python floats: for 2-3 components scalar arithmetic beats NumPy call overhead
+    p0, u0 = x0.tolist(), v0.tolist()
+    p1, u1 = x1.tolist(), v1.tolist()
+    
     if not gravity or ndim < 2:
         # Without gravity, use the simple linear approach but with correct reference times
-        # Get positions and velocities at current time
-        pos1, vel1 = ball1.get_position_and_velocity_at_time(current_time, ndim, gravity)
-        pos2, vel2 = ball2.get_position_and_velocity_at_time(current_time, ndim, gravity)
-        
-        # Relative position and velocity
-        rel_pos = pos2 - pos1
-        rel_vel = vel2 - vel1
+        dt0 = current_time - t0
+        dt1 = current_time - t1
+        if dt0 < 0 or dt1 < 0:
+            raise ValueError(f"Cannot compute collision at time {current_time} before ball times {t0}, {t1}")
+        
+        # Relative position and velocity at current time, propagated directly from stored state
+        pos_dot_vel = rel_vel_sq = rel_pos_sq = 0.0
+        for q0, w0, q1, w1 in zip(p0, u0, p1, u1):
+            rel_pos = (q1 + w1 * dt1) - (q0 + w0 * dt0)
+            rel_vel = w1 - w0
+            pos_dot_vel += rel_pos * rel_vel
+            rel_vel_sq += rel_vel * rel_vel
+            rel_pos_sq += rel_pos * rel_pos
         
         # CHEAP TEST FIRST: Check if balls are moving apart
-        pos_dot_vel = np.dot(rel_pos, rel_vel)
         if pos_dot_vel > 0:
             return None  # Moving apart, no collision
         
         # CHEAP TEST: Check if relative velocity is zero
-        rel_vel_sq = np.dot(rel_vel, rel_vel)
         if rel_vel_sq < 1e-24:
             return None
         
         # Solve quadratic: |rel_pos + rel_vel * dt|^2 = r^2
-        rel_pos_sq = np.dot(rel_pos, rel_pos)
         a = rel_vel_sq
         b = 2 * pos_dot_vel
         c = rel_pos_sq - r*r
@@ -62,21 +69,18 @@ def calculate_ball_ball_collision_time(ball1: 'Ball', ball2: 'Ball',
         if discriminant < 0:
             return None
         
+        # a > 0, so the '-' root is the earlier one; only compute the later root if it is rejected
         sqrt_discriminant = math.sqrt(discriminant)
-        t1 = (-b - sqrt_discriminant) / (2*a)
-        t2 = (-b + sqrt_discriminant) / (2*a)
-        
-        # Find earliest positive time
-        collision_time = None
+        inv_2a = 0.5 / a
+        t1 = (-b - sqrt_discriminant) * inv_2a
         if t1 > 1e-12:
-            collision_time = t1
-        if t2 > 1e-12 and (collision_time is None or t2 < collision_time):
-            collision_time = t2
+            return current_time + t1
         
-        if collision_time is None:
-            return None
+        t2 = (-b + sqrt_discriminant) * inv_2a
+        if t2 > 1e-12:
+            return current_time + t2
         
-        return current_time + collision_time
+        return None
     
     else:
         # With gravity, use exact equations of motion
@@ -85,37 +89,7 @@ def calculate_ball_ball_collision_time(ball1: 'Ball', ball2: 'Ball',
         
         # Set up the equation: |x1 + v1(t-t1) + 0.5*g*(t-t1)^2 - x0 - v0(t-t0) - 0.5*g*(t-t0)^2|^2 = r^2
         
-        # Let's expand this step by step:
-        # dx = x1 - x0
-        # dv = v1 - v0  
-        # dt_offset = t1 - t0
-        
-        dx = x1 - x0
-        dv = v1 - v0
-        dt_offset = t1 - t0
-        
-        # For the gravity term: 0.5*g*[(t-t1)^2 - (t-t0)^2]
-        # = 0.5*g*[t^2 - 2*t*t1 + t1^2 - t^2 + 2*t*t0 - t0^2]
-        # = 0.5*g*[2*t*(t0-t1) + t1^2 - t0^2]
-        # = g*t*(t0-t1) + 0.5*g*(t1^2 - t0^2)
-        
-        # So distance_vector(t) = dx + dv*t - dv*t0 + v1*t0 - v1*t1 + g*t*(t0-t1) + 0.5*g*(t1^2 - t0^2)
-        # Simplifying: distance_vector(t) = [dx + dv*(-t0) + v1*(t0-t1) + 0.5*g*(t1^2-t0^2)] + t*[dv + g*(t0-t1)]
-        
-        # Set up gravity vector g = [0, -1] in 2D
-        g = np.zeros_like(x0)
-        g[1] = -1.0  # gravity in negative y direction
-        
-        # Constant term
-        const_term = dx + dv*(-t0) + v1*(t0-t1) + 0.5*g*(t1*t1 - t0*t0)
-        
-        # Linear coefficient 
-        linear_coeff = dv + g*(t0-t1)
-        
-        # Gravity coefficient (coefficient of t^2 term is zero because gravity affects both balls equally)
-        # Wait, let me recalculate this properly...
-        
-        # Actually, let's be more systematic. The distance vector at time t is:
+        # The distance vector at time t is:
         # d(t) = [x1 + v1*(t-t1) + 0.5*g*(t-t1)^2] - [x0 + v0*(t-t0) + 0.5*g*(t-t0)^2]
         
         # Expanding:
@@ -126,19 +100,32 @@ def calculate_ball_ball_collision_time(ball1: 'Ball', ball2: 'Ball',
         # (t-t1)^2 - (t-t0)^2 = t^2 - 2*t*t1 + t1^2 - t^2 + 2*t*t0 - t0^2
         #                     = 2*t*(t0-t1) + (t1^2 - t0^2)
         
-        # So: d(t) = (x1-x0) + (v0*t0-v1*t1) + 0.5*g*(t1^2-t0^2) + t*[(v1-v0) + g*(t0-t1)]
+        # So: d(t) = A + B*t with
+        # A = (x1-x0) + (v0*t0-v1*t1) + 0.5*g*(t1^2-t0^2)  (constant term)
+        # B = (v1-v0) + g*(t0-t1)                          (linear term coefficient)
         
-        A = dx + v0*t0 - v1*t1 + 0.5*g*(t1*t1 - t0*t0)  # constant term
-        B = dv + g*(t0-t1)  # linear term coefficient
+        # Gravity g = -1 acts only on y, so the other components have no gravity
+        # correction, so work component-wise.
+        Ax = p1[0] - p0[0] + u0[0]*t0 - u1[0]*t1
+        Bx = u1[0] - u0[0]
+        Ay = p1[1] - p0[1] + u0[1]*t0 - u1[1]*t1 - 0.5*(t1*t1 - t0*t0)
+        By = u1[1] - u0[1] - (t0 - t1)
         
         # Now we need to solve |A + B*t|^2 = r^2
         # (A + B*t) · (A + B*t) = r^2
         # A·A + 2*A·B*t + B·B*t^2 = r^2
         # B·B*t^2 + 2*A·B*t + (A·A - r^2) = 0
         
-        a_coeff = np.dot(B, B)  # coefficient of t^2
-        b_coeff = 2 * np.dot(A, B)  # coefficient of t
-        c_coeff = np.dot(A, A) - r*r  # constant term
+        a_coeff = Bx*Bx + By*By  # coefficient of t^2
+        b_coeff = 2 * (Ax*Bx + Ay*By)  # coefficient of t
+        c_coeff = Ax*Ax + Ay*Ay - r*r  # constant term
+        
+        if ndim == 3:
+            Az = p1[2] - p0[2] + u0[2]*t0 - u1[2]*t1
+            Bz = u1[2] - u0[2]
+            a_coeff += Bz*Bz
+            b_coeff += 2 * Az*Bz
+            c_coeff += Az*Az
         
         # Check if this is actually a quadratic (a_coeff != 0)
         if abs(a_coeff) < 1e-24:
@@ -156,121 +143,281 @@ def calculate_ball_ball_collision_time(ball1: 'Ball', ball2: 'Ball',
         if discriminant < 0:
             return None
         
+        # a_coeff = B·B > 0, so the '-' root is the earlier one; only compute the later root if it is rejected
         sqrt_discriminant = math.sqrt(discriminant)
-        t1_sol = (-b_coeff - sqrt_discriminant) / (2*a_coeff)
-        t2_sol = (-b_coeff + sqrt_discriminant) / (2*a_coeff)
+        inv_2a = 0.5 / a_coeff
+        threshold = current_time + 1e-12
+        t1_sol = (-b_coeff - sqrt_discriminant) * inv_2a
+        if t1_sol > threshold:
+            return t1_sol
         
-        # Find earliest time that's in the future
-        collision_time = None
-        if t1_sol > current_time + 1e-12:
-            collision_time = t1_sol
-        if t2_sol > current_time + 1e-12 and (collision_time is None or t2_sol < collision_time):
-            collision_time = t2_sol
+        t2_sol = (-b_coeff + sqrt_discriminant) * inv_2a
+        if t2_sol > threshold:
+            return t2_sol
         
-        return collision_time
+        return None
 
 
-def calculate_ball_wall_collision_time(ball: 'Ball', wall: 'Wall', 
-                                       current_time: float, ndim: int,
-                                       gravity: bool = False) -> Optional[float]:
+def calculate_ball_ball_collision_times(positions: np.ndarray, velocities: np.ndarray,
+                                        times: np.ndarray, radii: np.ndarray,
+                                        first: np.ndarray, second: np.ndarray,
+                                        current_time: float, gravity: bool = False) -> np.ndarray:
     """
-    Calculate when a ball will collide with a wall, if at all.
+    Calculate collision times for many ball pairs at once.
+    
+    Ball state is given as arrays (one row per ball). Each ball is first propagated
+    to current_time; after that gravity accelerates both balls of a pair equally, so
+    the relative motion is linear and every pair reduces to the same quadratic.
+    The position, velocity and radius arrays may be float32 to halve the memory
+    gathered per pair; times stay float64 so absolute timestamps keep full
+    precision, and the quadratic itself is always solved in float64.
     
     Args:
-        ball: the ball
-        wall: the wall
-        current_time: current simulation time
-        ndim: number of dimensions
+        positions: (N, ndim) ball positions at their reference times
+        velocities: (N, ndim) ball velocities at their reference times
+        times: (N,) ball reference times
+        radii: (N,) ball radii
+        first: (M,) indices of the first ball of each pair
+        second: (M,) indices of the second ball of each pair
+        current_time: current simulation time (collisions must be after this)
         gravity: whether gravity is enabled
         
     Returns:
-        collision time if collision occurs in future, None otherwise
+        (M,) array of collision times, np.inf where no collision occurs in future
     """
-    # Get ball position and velocity at current time
-    pos, vel = ball.get_position_and_velocity_at_time(current_time, ndim, gravity)
+    dt = current_time - times
+    if np.any(dt < 0):
+        raise ValueError(f"Cannot compute collisions at time {current_time} before ball times")
+    
+    # Propagate all balls to current time; only the short offset dt is rounded to the state dtype
+    dt = dt.astype(positions.dtype, copy=False)
+    pos = positions + velocities * dt[:, None]
+    vel = velocities
+    if gravity:
+        pos[:, 1] -= 0.5 * dt * dt
+        vel = velocities.copy()
+        vel[:, 1] -= dt
+    
+    # Relative position and velocity for each pair, upcast so the discriminant keeps full precision
+    rel_pos = (pos[second] - pos[first]).astype(np.float64, copy=False)
+    rel_vel = (vel[second] - vel[first]).astype(np.float64, copy=False)
+    r = (radii[first] + radii[second]).astype(np.float64, copy=False)
+    
+    # Quadratic coefficients: |rel_pos + rel_vel * dt|^2 = r^2
+    pos_dot_vel = np.einsum('ij,ij->i', rel_pos, rel_vel)
+    a = np.einsum('ij,ij->i', rel_vel, rel_vel)
+    b = 2 * pos_dot_vel
+    c = np.einsum('ij,ij->i', rel_pos, rel_pos) - r * r
+    discriminant = b * b - 4 * a * c
     
-    wall_axis = wall.normal_axis
+    # Same cheap tests as the scalar version: approaching, moving, real roots
+    candidates = np.flatnonzero((pos_dot_vel <= 0) & (a >= 1e-24) & (discriminant >= 0))
     
+    collision_times = np.full(len(first), np.inf)
+    sqrt_discriminant = np.sqrt(discriminant[candidates])
+    two_a = 2 * a[candidates]
+    t1 = (-b[candidates] - sqrt_discriminant) / two_a
+    t2 = (-b[candidates] + sqrt_discriminant) / two_a
+    
+    # Earliest positive root (t1 <= t2 since a > 0)
+    earliest = np.where(t1 > 1e-12, t1, np.where(t2 > 1e-12, t2, np.inf))
+    collision_times[candidates] = current_time + earliest
+    
+    return collision_times
+
+
+def _wall_collision_dt(p: float, v: float, radius: float, coordinate: float,
+                       gravity_axis: bool) -> float:
+    """
+    Time until a ball touches a wall, using scalar arithmetic only.
+    
+    Args:
+        p: ball center coordinate along the wall's normal axis
+        v: ball velocity along the wall's normal axis
+        radius: ball radius
+        coordinate: wall coordinate along its normal axis
+        gravity_axis: whether gravity acts along the wall's normal axis
+        
+    Returns:
+        time from now until the ball surface reaches the wall, math.inf if never
+    """
     # Distance from ball center to wall
-    ball_to_wall = wall.coordinate - pos[wall_axis]
+    ball_to_wall = coordinate - p
     
     # Determine collision coordinate (where ball surface touches wall)
     if ball_to_wall > 0:
         # Ball is on negative side of wall - collision when ball surface reaches wall
-        collision_coord = wall.coordinate - ball.radius
+        collision_coord = coordinate - radius
     else:
         # Ball is on positive side of wall - collision when ball surface reaches wall
-        collision_coord = wall.coordinate + ball.radius
-    
-    velocity_component = vel[wall_axis]
+        collision_coord = coordinate + radius
     
-    if wall_axis == 1 and gravity:
+    if gravity_axis:
         # Y-direction with gravity - solve quadratic
         
         # Solve: pos_y + vel_y*t - 0.5*t^2 = collision_coord
         # Rearrange: 0.5*t^2 + (-vel_y)*t + (collision_coord - pos_y) = 0
         a = 0.5
-        b = -vel[1]  # -vel[1] = -(-1.0) = +1.0 for downward motion
-        c = collision_coord - pos[1]  # 2.4 - 5.0 = -2.6
+        b = -v  # -vel[1] = -(-1.0) = +1.0 for downward motion
+        c = collision_coord - p  # 2.4 - 5.0 = -2.6
         
         # Check discriminant before sqrt
         discriminant = b*b - 4*a*c
         if discriminant < 0:
-            return None
+            return math.inf
             
         sqrt_discriminant = math.sqrt(discriminant)
         t1 = (-b + sqrt_discriminant) / (2*a)
         t2 = (-b - sqrt_discriminant) / (2*a)
         
-        collision_time = None
-        if t1 > 1e-12:
-            collision_time = t1
-        if t2 > 1e-12 and (collision_time is None or t2 < collision_time):
-            collision_time = t2
-    else:
-        # Linear motion - CHEAP!
-        if abs(velocity_component) < 1e-12:
-            return None  # Not moving toward wall
-        
-        collision_distance = collision_coord - pos[wall_axis]
-        collision_time = collision_distance / velocity_component
-        if collision_time <= 1e-12:
-            return None  # Collision in past
+        return min(t1 if t1 > 1e-12 else math.inf,
+                   t2 if t2 > 1e-12 else math.inf)
     
-    if collision_time is None:
-        return None
+    # Linear motion - CHEAP!
+    if abs(v) < 1e-12:
+        return math.inf  # Not moving toward wall
     
-    return current_time + collision_time
+    collision_time = (collision_coord - p) / v
+    if collision_time <= 1e-12:
+        return math.inf  # Collision in past
+    return collision_time
 
 
-def calculate_ball_grid_transit_time(ball: 'Ball', current_time: float, ndim: int,
-                                     cell_size: float, gravity: bool = False) -> Optional[tuple]:
+def calculate_ball_wall_collision_time(ball: 'Ball', wall: 'Wall', 
+                                       current_time: float, ndim: int,
+                                       gravity: bool = False) -> Optional[float]:
     """
-    Calculate when a ball will cross a cell boundary, if at all.
+    Calculate when a ball will collide with a wall, if at all.
     
     Args:
         ball: the ball
+        wall: the wall
         current_time: current simulation time
         ndim: number of dimensions
-        cell_size: size of grid cells
         gravity: whether gravity is enabled
         
     Returns:
-        (collision_time, new_cell) if transit occurs, None otherwise
+        collision time if collision occurs in future, None otherwise
+    """
+    return calculate_ball_walls_collision_times(ball, [wall], current_time, ndim, gravity)[0]
+
+
+def calculate_ball_walls_collision_times(ball: 'Ball', walls: List['Wall'],
+                                         current_time: float, ndim: int,
+                                         gravity: bool = False) -> List[Optional[float]]:
+    """
+    Calculate when a ball will collide with each of several walls.
+    
+    The ball is propagated to current_time once and every wall is then tested
+    with scalar arithmetic, so a single ball costs no per-wall array work.
+    
+    Args:
+        ball: the ball
+        walls: walls to test
+        current_time: current simulation time
+        ndim: number of dimensions
+        gravity: whether gravity is enabled
+        
+    Returns:
+        collision time per wall, None where no collision occurs in future
+    """
+    # Get ball position and velocity at current time as Python floats
+    pos, vel = ball.get_state_at_time(current_time, ndim, gravity)
+    
+    collision_times = []
+    for wall in walls:
+        axis = wall.normal_axis
+        dt = _wall_collision_dt(pos[axis], vel[axis], ball.radius, wall.coordinate, gravity and axis == 1)
+        collision_times.append(None if dt == math.inf else current_time + dt)
+    return collision_times
+
+
+def calculate_ball_wall_collision_times(positions: np.ndarray, velocities: np.ndarray,
+                                        times: np.ndarray, radii: np.ndarray,
+                                        wall_axes: np.ndarray, wall_coordinates: np.ndarray,
+                                        current_time: float, gravity: bool = False) -> np.ndarray:
+    """
+    Calculate collision times of every ball against every wall in one vectorized pass.
+    
+    Args:
+        positions: (N, ndim) ball positions at their reference times
+        velocities: (N, ndim) ball velocities at their reference times
+        times: (N,) ball reference times
+        radii: (N,) ball radii
+        wall_axes: (W,) normal axis of each wall (see wall.pack_walls)
+        wall_coordinates: (W,) coordinate of each wall along its normal axis
+        current_time: current simulation time
+        gravity: whether gravity is enabled
+        
+    Returns:
+        (N, W) array of collision times, np.inf where no collision occurs in future
     """
-    pos, vel = ball.get_position_and_velocity_at_time(current_time, ndim, gravity)
+    dt = current_time - times
+    if np.any(dt < 0):
+        raise ValueError(f"Cannot compute collisions at time {current_time} before ball times")
+    
+    # Propagate all balls to current time; only the short offset dt is rounded to the state dtype
+    dt = dt.astype(positions.dtype, copy=False)
+    pos = positions + velocities * dt[:, None]
+    vel = velocities
+    if gravity:
+        pos[:, 1] -= 0.5 * dt * dt
+        vel = velocities.copy()
+        vel[:, 1] -= dt
+    
+    # Each ball's position and velocity along each wall's normal axis: (N, W)
+    p = pos[:, wall_axes]
+    v = vel[:, wall_axes]
+    r = radii[:, None]
+    
+    # Collision when the ball surface on the wall's side touches the wall
+    collision_coord = np.where(wall_coordinates - p > 0, wall_coordinates - r, wall_coordinates + r)
+    
+    # Linear motion: t = (collision_coord - p) / v for balls moving along the normal
+    moving = np.abs(v) >= 1e-12
+    linear_time = (collision_coord - p) / np.where(moving, v, 1.0)
+    collision_times = np.where(moving & (linear_time > 1e-12), linear_time, np.inf)
     
-    earliest_time = None
-    new_cell = None
+    if gravity:
+        # Y walls with gravity: 0.5*t^2 - v*t + (collision_coord - p) = 0, roots v +/- sqrt(v^2 - 2*c)
+        y_walls = np.flatnonzero(wall_axes == 1)
+        vy = v[:, y_walls]
+        discriminant = vy*vy - 2.0*(collision_coord[:, y_walls] - p[:, y_walls])
+        sqrt_discriminant = np.sqrt(np.maximum(discriminant, 0.0))
+        t1 = vy + sqrt_discriminant
+        t2 = vy - sqrt_discriminant
+        earliest = np.minimum(np.where(t1 > 1e-12, t1, np.inf), np.where(t2 > 1e-12, t2, np.inf))
+        collision_times[:, y_walls] = np.where(discriminant >= 0, earliest, np.inf)
+    
+    return current_time + collision_times
+
+
+def _earliest_cell_crossing(pos: list, vel: list, cell: tuple, ndim: int,
+                            cell_size: float, gravity: bool) -> tuple:
+    """
+    Find the earliest cell boundary crossing using scalar arithmetic only.
+    
+    Args:
+        pos: ball position at the current time as Python floats
+        vel: ball velocity at the current time as Python floats
+        cell: current cell indices
+        ndim: number of dimensions
+        cell_size: size of grid cells
+        gravity: whether gravity is enabled
+        
+    Returns:
+        (dt, axis, delta) for the earliest crossing, where delta is -1 or +1;
+        dt is math.inf if the ball never leaves its cell
+    """
+    earliest_time = math.inf
+    best_axis = -1
+    best_delta = 0
     
     # Check each dimension for cell boundary crossings
     for axis in range(ndim):
-        current_cell_coord = ball.cell[axis]
-        velocity_component = vel[axis]
-        
-        # CHEAP TEST: Skip if not moving in this direction
-        if abs(velocity_component) < 1e-12 and not (axis == 1 and gravity):
-            continue
+        current_cell_coord = cell[axis]
+        p = pos[axis]
+        v = vel[axis]
         
         # Calculate boundaries
         left_boundary = current_cell_coord * cell_size
@@ -278,43 +425,156 @@ def calculate_ball_grid_transit_time(ball: 'Ball', current_time: float, ndim: in
         
         if axis == 1 and gravity:
             # Y-direction with gravity - quadratic
-            for boundary, new_coord in [(left_boundary, current_cell_coord - 1),
-                                       (right_boundary, current_cell_coord + 1)]:
-                # -0.5*t^2 + vel_y*t + (pos_y - boundary) = 0
-                a = -0.5
-                b = vel[1]
-                c = pos[1] - boundary
-                
-                discriminant = b*b - 4*a*c
-                if discriminant >= 0:
-                    sqrt_discriminant = math.sqrt(discriminant)
-                    t1 = (-b + sqrt_discriminant) / (2*a)
-                    t2 = (-b - sqrt_discriminant) / (2*a)
-                    
-                    for t in [t1, t2]:
-                        if t > 1e-12 and (earliest_time is None or t < earliest_time):
-                            earliest_time = t
-                            new_cell_coords = list(ball.cell)
-                            new_cell_coords[axis] = new_coord
-                            new_cell = tuple(new_cell_coords)
+            # -0.5*t^2 + v*t + (p - boundary) = 0, so discriminant = v^2 + 2*(p - boundary)
+            # and the roots (-v -/+ sqrt) / (2 * -0.5) are v -/+ sqrt
+            for boundary, delta in ((left_boundary, -1), (right_boundary, 1)):
+                discriminant = v*v + 2.0*(p - boundary)
+                if discriminant < 0:
+                    continue
+                sqrt_discriminant = math.sqrt(discriminant)
+                for t in (v - sqrt_discriminant, v + sqrt_discriminant):
+                    if 1e-12 < t < earliest_time:
+                        earliest_time = t
+                        best_axis = axis
+                        best_delta = delta
         else:
+            # CHEAP TEST: Skip if not moving in this direction
+            if abs(v) < 1e-12:
+                continue
+            
             # Linear motion - CHEAP!
-            for boundary, new_coord in [(left_boundary, current_cell_coord - 1),
-                                       (right_boundary, current_cell_coord + 1)]:
-                t = (boundary - pos[axis]) / velocity_component
-                
-                if t > 1e-12 and (earliest_time is None or t < earliest_time):
+            for boundary, delta in ((left_boundary, -1), (right_boundary, 1)):
+                t = (boundary - p) / v
+                if 1e-12 < t < earliest_time:
                     earliest_time = t
-                    new_cell_coords = list(ball.cell)
-                    new_cell_coords[axis] = new_coord
-                    new_cell = tuple(new_cell_coords)
+                    best_axis = axis
+                    best_delta = delta
+    
+    return earliest_time, best_axis, best_delta
+
+
+def calculate_ball_grid_transit_times(positions: np.ndarray, velocities: np.ndarray,
+                                      times: np.ndarray, cells: np.ndarray, current_time: float,
+                                      cell_size: float, gravity: bool = False) -> tuple:
+    """
+    Calculate when each of many balls will cross a cell boundary, in one vectorized pass.
+    
+    Candidate crossings are laid out in the same order the scalar scan visits them
+    (axis, then lower/upper boundary, then root), so argmin picks the same winner.
+    
+    Args:
+        positions: (N, ndim) ball positions at their reference times
+        velocities: (N, ndim) ball velocities at their reference times
+        times: (N,) ball reference times
+        cells: (N, ndim) current cell indices
+        current_time: current simulation time
+        cell_size: size of grid cells
+        gravity: whether gravity is enabled
+        
+    Returns:
+        (transit_times, axes, deltas) arrays of shape (N,); transit_times is np.inf
+        for balls that never leave their cell
+    """
+    dt = current_time - times
+    if np.any(dt < 0):
+        raise ValueError(f"Cannot compute transits at time {current_time} before ball times")
     
-    if earliest_time is None:
+    # Propagate all balls to current time; only the short offset dt is rounded to the state dtype
+    dt = dt.astype(positions.dtype, copy=False)
+    pos = positions + velocities * dt[:, None]
+    vel = velocities
+    if gravity:
+        pos[:, 1] -= 0.5 * dt * dt
+        vel = velocities.copy()
+        vel[:, 1] -= dt
+    
+    candidates = []
+    candidate_axes = []
+    candidate_deltas = []
+    for axis in range(positions.shape[1]):
+        p = pos[:, axis]
+        v = vel[:, axis]
+        left_boundary = cells[:, axis] * cell_size
+        right_boundary = left_boundary + cell_size
+        
+        for boundary, delta in ((left_boundary, -1), (right_boundary, 1)):
+            if axis == 1 and gravity:
+                # Roots of -0.5*t^2 + v*t + (p - boundary) = 0 are v -/+ sqrt(v^2 + 2*(p - boundary))
+                discriminant = v*v + 2.0*(p - boundary)
+                sqrt_discriminant = np.sqrt(np.maximum(discriminant, 0.0))
+                roots = (np.where(discriminant >= 0, v - sqrt_discriminant, np.inf),
+                         np.where(discriminant >= 0, v + sqrt_discriminant, np.inf))
+            else:
+                moving = np.abs(v) >= 1e-12
+                roots = (np.where(moving, (boundary - p) / np.where(moving, v, 1.0), np.inf),)
+            
+            for t in roots:
+                candidates.append(np.where(t > 1e-12, t, np.inf))
+                candidate_axes.append(axis)
+                candidate_deltas.append(delta)
+    
+    candidates = np.stack(candidates, axis=1)
+    best = np.argmin(candidates, axis=1)
+    transit_times = current_time + candidates[np.arange(len(best)), best]
+    
+    return transit_times, np.array(candidate_axes)[best], np.array(candidate_deltas)[best]
+
+
+def calculate_ball_grid_transit_time(ball: 'Ball', current_time: float, ndim: int,
+                                     cell_size: float, gravity: bool = False) -> Optional[tuple]:
+    """
+    Calculate when a ball will cross a cell boundary, if at all.
+    
+    Args:
+        ball: the ball
+        current_time: current simulation time
+        ndim: number of dimensions
+        cell_size: size of grid cells
+        gravity: whether gravity is enabled
+        
+    Returns:
+        (collision_time, new_cell) if transit occurs, None otherwise
+    """
+    # Python floats so the per-axis scan avoids NumPy scalar overhead
+    pos, vel = ball.get_state_at_time(current_time, ndim, gravity)
+    
+    earliest_time, axis, delta = _earliest_cell_crossing(pos, vel, ball.cell, ndim, cell_size, gravity)
+    
+    if earliest_time == math.inf:
         return None
     
+    # Build the new cell tuple once, for the winning axis only, without an intermediate list
+    cell = ball.cell
+    new_cell = cell[:axis] + (cell[axis] + delta,) + cell[axis + 1:]
+    
     return current_time + earliest_time, new_cell
 
 
+def find_overlapping_pair(positions: np.ndarray, radii: np.ndarray) -> Optional[Tuple[int, int, float]]:
+    """
+    Find the first pair of overlapping balls.
+    
+    Every pair is checked, one ball at a time against all higher-indexed balls in a
+    single vectorized step, so the result does not depend on grid bookkeeping.
+    
+    Args:
+        positions: (N, ndim) ball positions at a common time
+        radii: (N,) ball radii
+        
+    Returns:
+        (i, j, distance) for the first overlapping pair in (i, j) order with i < j,
+        None if no balls overlap
+    """
+    for i in range(len(positions) - 1):
+        rel_pos = positions[i + 1:] - positions[i]
+        distances = np.sqrt(np.einsum('ij,ij->i', rel_pos, rel_pos))
+        overlapping = np.flatnonzero(distances < radii[i] + radii[i + 1:])
+        if len(overlapping) > 0:
+            k = int(overlapping[0])
+            return i, i + 1 + k, float(distances[k])
+    return None
+
+
 def perform_ball_ball_collision(ball1: 'Ball', ball2: 'Ball', restitution: float):
     """
     Perform collision between two balls, updating their velocities.
@@ -324,22 +584,26 @@ def perform_ball_ball_collision(ball1: 'Ball', ball2: 'Ball', restitution: float
         ball2: second ball (modified in place) 
         restitution: coefficient of restitution
     """
-    # Calculate collision normal
-    rel_pos = ball2.position - ball1.position
-    distance_sq = np.dot(rel_pos, rel_pos)
+    # Work on Python floats: for 2-3 components scalar arithmetic beats NumPy call overhead
+    rel_pos = [q2 - q1 for q1, q2 in zip(ball1.position.tolist(), ball2.position.tolist())]
+    distance_sq = 0.0
+    for x in rel_pos:
+        distance_sq += x * x
     
     # CHEAP TEST: avoid expensive sqrt
     if distance_sq < 1e-24:
         # Balls at same position - arbitrary normal
-        normal = np.zeros_like(ball1.position)
-        normal[0] = 1.0
+        normal = [1.0] + [0.0] * (len(rel_pos) - 1)
     else:
         distance = math.sqrt(distance_sq)  # Only sqrt when needed
-        normal = rel_pos / distance
+        normal = [x / distance for x in rel_pos]
     
     # Relative velocity
-    rel_vel = ball2.velocity - ball1.velocity
-    vel_along_normal = np.dot(rel_vel, normal)
+    u1 = ball1.velocity.tolist()
+    u2 = ball2.velocity.tolist()
+    vel_along_normal = 0.0
+    for w1, w2, n in zip(u1, u2, normal):
+        vel_along_normal += (w2 - w1) * n
     
     # CHEAP TEST: if separating, no collision needed
     if vel_along_normal > 0:
@@ -347,10 +611,10 @@ def perform_ball_ball_collision(ball1: 'Ball', ball2: 'Ball', restitution: float
     
     # Update velocities (equal mass case)
     delta_vel = -(1 + restitution) * vel_along_normal
-    velocity_change = (delta_vel / 2.0) * normal
+    velocity_change = [(delta_vel / 2.0) * n for n in normal]
     
-    ball1.velocity -= velocity_change
-    ball2.velocity += velocity_change
+    ball1.velocity[:] = [w - dv for w, dv in zip(u1, velocity_change)]
+    ball2.velocity[:] = [w + dv for w, dv in zip(u2, velocity_change)]
 
 
 def perform_ball_wall_collision(ball: 'Ball', wall: 'Wall', restitution: float):
@@ -362,24 +626,17 @@ def perform_ball_wall_collision(ball: 'Ball', wall: 'Wall', restitution: float):
         wall: the wall
         restitution: coefficient of restitution
     """
-    # Get wall normal pointing away from wall surface toward ball
-    normal = np.zeros(len(ball.position))
-    
-    # Determine normal direction based on which side of wall the ball is on
-    ball_coordinate = ball.position[wall.normal_axis]
-    if ball_coordinate < wall.coordinate:
-        # Ball is on negative side - normal points in negative direction
-        normal[wall.normal_axis] = -1.0
-    else:
-        # Ball is on positive side - normal points in positive direction  
-        normal[wall.normal_axis] = 1.0
+    axis = wall.normal_axis
+    
+    # Sign of the wall normal pointing toward the ball (only one component is non-zero)
+    sign = -1.0 if ball.position[axis] < wall.coordinate else 1.0
     
     # Velocity component along normal (toward wall is negative)
-    vel_along_normal = np.dot(ball.velocity, normal)
+    vel_along_normal = sign * ball.velocity[axis]
     
     # CHEAP TEST: if moving away from wall, no collision
     if vel_along_normal >= 0:
         return
     
-    # Reflect velocity component along normal
-    ball.velocity -= (1 + restitution) * vel_along_normal * normal
\ No newline at end of file
+    # Reflect velocity component along normal: v - (1 + e) * v = -e * v
+    ball.velocity[axis] *= -restitution
@@ -1,27 +1,51 @@
 import numpy as np
+import json
 import os
 from typing import List, Tuple, Dict, Any
-from .ball import Ball
+from .ball import Ball, BallState
 from .wall import create_box_walls
 from .grid import Grid
 from .event_heap import EventHeap
-from .events import ExportEvent, EndEvent
-from .event_generation import generate_events_for_ball
+from .events import BallBallCollision, BallWallCollision, BallGridTransit, ExportEvent, EndEvent
+from .event_generation import generate_ball_ball_events_batch, generate_ball_wall_events_batch, generate_ball_grid_events_batch
+
+# Binary output: all frames are appended to one file, stored as float32
+BINARY_FRAMES_FILENAME = "frames.bin"
+BINARY_FRAME_DTYPE = np.float32
+
+# Progress log line, pre-formatted so the hot loop skips building a dict for json.dumps.
+# Produces the same JSON text json.dumps would for these fields, given a Python float
+# time and the event text already encoded as a JSON string.
+_PROGRESS_LOG_FORMAT = '{"event_type": "ProcessingEvent", "event_count": %d, "time": %r, "current_event": %s}'
 
 
 class OutputManager:
     """Manages output file writing for simulation data."""
     
-    def __init__(self, output_dir: str = "runs"):
+    def __init__(self, output_dir: str = "runs", output_format: str = "text", buffer_size: int = 64):
         """
         Initialize output manager.
         
         Args:
             output_dir: directory to write output files
+            output_format: 'text' for one frame_NNNNNN.txt file per frame, or
+                'binary' to append all frames to a single frames.bin file
+            buffer_size: number of binary frames held in memory between writes (at least 1)
         """
+        if output_format not in ("text", "binary"):
+            raise ValueError(f"Unsupported output format: {output_format}")
+        if buffer_size < 1:
+            raise ValueError(f"buffer_size must be at least 1, got {buffer_size}")
+        
         self.output_dir = output_dir
+        self.output_format = output_format
         os.makedirs(output_dir, exist_ok=True)
         self.frame_count = 0
+        self.buffer_size = buffer_size
+        self._buffer = []
+        self._binary_file = None
+        if output_format == "binary":
+            self._binary_file = open(os.path.join(output_dir, BINARY_FRAMES_FILENAME), 'wb')
         
     def write_frame(self, time: float, positions: List[np.ndarray], velocities: List[np.ndarray]):
         """
@@ -32,20 +56,56 @@ class OutputManager:
             positions: list of ball positions
             velocities: list of ball velocities
         """
+        if self._binary_file is not None:
+            self._write_binary_frame(time, positions, velocities)
+            self.frame_count += 1
+            return
+        
         filename = os.path.join(self.output_dir, f"frame_{self.frame_count:06d}.txt")
         
-        with open(filename, 'w') as f:
-            f.write(f"# Time: {time}\n")
-            f.write(f"# Balls: {len(positions)}\n")
-            
-            for i, (pos, vel) in enumerate(zip(positions, velocities)):
-                if len(pos) == 2:
-                    f.write(f"{i} {pos[0]} {pos[1]} {vel[0]} {vel[1]}\n")
-                elif len(pos) == 3:
-                    f.write(f"{i} {pos[0]} {pos[1]} {pos[2]} {vel[0]} {vel[1]} {vel[2]}\n")
+        # One row per ball: index, position, velocity, formatted by a single np.savetxt call
+        positions = np.asarray(positions)
+        num_balls, ndim = positions.shape
+        rows = np.empty((num_balls, 1 + 2 * ndim))
+        rows[:, 0] = np.arange(num_balls)
+        rows[:, 1:1 + ndim] = positions
+        rows[:, 1 + ndim:] = velocities
+        
+        fmt = ' '.join(['%d'] + ['%.17g'] * (2 * ndim))
+        np.savetxt(filename, rows, fmt=fmt, header=f"Time: {time}\nBalls: {num_balls}", comments='# ')
         
         self.frame_count += 1
     
+    def _write_binary_frame(self, time: float, positions: List[np.ndarray], velocities: List[np.ndarray]):
+        """Append one frame to the binary frames file (see read_binary_frames for the layout)."""
+        state = np.hstack([np.asarray(positions), np.asarray(velocities)]).astype(BINARY_FRAME_DTYPE)
+        
+        if self.frame_count == 0:
+            # File header: number of dimensions and bytes per stored value
+            ndim = state.shape[1] // 2
+            self._buffer.append(np.array([ndim, state.itemsize], dtype=np.int32).tobytes())
+        
+        self._buffer.append(np.array([time], dtype=np.float64).tobytes())
+        self._buffer.append(np.array([len(state)], dtype=np.int32).tobytes())
+        self._buffer.append(state.tobytes())
+        
+        if self.frame_count % self.buffer_size == self.buffer_size - 1:
+            self.flush()
+    
+    def flush(self):
+        """Write buffered binary frames to disk in a single call."""
+        if self._binary_file is not None and self._buffer:
+            self._binary_file.write(b''.join(self._buffer))
+            self._binary_file.flush()
+            self._buffer = []
+    
+    def close(self):
+        """Flush and close any open output files."""
+        if self._binary_file is not None:
+            self.flush()
+            self._binary_file.close()
+            self._binary_file = None
+    
     def write_parameters(self, params: Dict[str, Any]):
         """
         Write simulation parameters to file.
@@ -53,13 +113,49 @@ class OutputManager:
         Args:
             params: dictionary of simulation parameters
         """
-        import json
         filename = os.path.join(self.output_dir, "parameters.json")
         
         with open(filename, 'w') as f:
             json.dump(params, f, indent=2)
 
 
+def read_binary_frames(filename: str) -> List[Tuple[float, np.ndarray, np.ndarray]]:
+    """
+    Read frames written by OutputManager in binary format.
+    
+    Layout: an int32 header (ndim, bytes per value), then for each frame a float64
+    time, an int32 ball count, and a (num_balls, 2*ndim) float32 block holding
+    positions followed by velocities for each ball.
+    
+    Args:
+        filename: path to a frames.bin file
+        
+    Returns:
+        list of (time, positions, velocities) tuples, one per frame
+    """
+    data = np.fromfile(filename, dtype=np.uint8)
+    if len(data) == 0:
+        return []
+    
+    ndim, itemsize = data[:8].view(np.int32)
+    dtype = np.dtype(f"f{itemsize}")
+    
+    frames = []
+    offset = 8
+    while offset < len(data):
+        time = float(data[offset:offset + 8].view(np.float64)[0])
+        num_balls = int(data[offset + 8:offset + 12].view(np.int32)[0])
+        offset += 12
+        
+        size = num_balls * 2 * ndim * itemsize
+        state = data[offset:offset + size].view(dtype).reshape(num_balls, 2 * ndim)
+        offset += size
+        
+        frames.append((time, state[:, :ndim].astype(np.float64), state[:, ndim:].astype(np.float64)))
+    
+    return frames
+
+
 def validate_simulation_parameters(params: Dict[str, Any]) -> None:
     """
     Validate simulation parameters.
@@ -104,7 +200,39 @@ def validate_simulation_parameters(params: Dict[str, Any]) -> None:
         raise ValueError("simulation_time must be positive")
 
 
-def initialize_simulation(params: Dict[str, Any]) -> Tuple[List[Ball], List, Grid, EventHeap, OutputManager]:
+def _initial_ball_state(num_balls: int, cell_counts: Tuple[int, ...],
+                        random_seed: int, legacy_rng: bool = False) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build initial ball state as arrays: one ball centered in each cell, gaussian velocities.
+    
+    Args:
+        num_balls: number of balls
+        cell_counts: number of whole cells along each axis
+        random_seed: seed for the velocity draw
+        legacy_rng: draw velocities with the legacy RandomState generator
+        
+    Returns:
+        (positions, velocities, cells) with shapes (num_balls, ndim); cells is int32
+    """
+    ndim = len(cell_counts)
+    
+    # Simple placement: fill whole cells along x, then y, then z
+    cells = np.stack(np.unravel_index(np.arange(num_balls), cell_counts, order='F'), axis=1).astype(np.int32)
+    
+    # Center each ball in its own cell
+    positions = cells + 0.5
+    
+    # Draw all gaussian velocities up front from a seeded generator for reproducible results
+    if legacy_rng:
+        # Same velocities as runs made before the switch to np.random.default_rng
+        velocities = np.random.RandomState(random_seed).normal(0.0, 1.0, (num_balls, ndim))
+    else:
+        velocities = np.random.default_rng(random_seed).standard_normal((num_balls, ndim))
+    
+    return positions, velocities, cells
+
+
+def initialize_simulation(params: Dict[str, Any]) -> Tuple[List[Ball], List, Grid, EventHeap, OutputManager, BallState]:
     """
     Initialize simulation components.
     
@@ -112,7 +240,8 @@ def initialize_simulation(params: Dict[str, Any]) -> Tuple[List[Ball], List, Gri
         params: simulation parameters
         
     Returns:
-        tuple of (balls, walls, grid, event_heap, output_manager)
+        tuple of (balls, walls, grid, event_heap, output_manager, state); the balls
+        are views of the shared state arrays
     """
     validate_simulation_parameters(params)
     
@@ -129,50 +258,66 @@ def initialize_simulation(params: Dict[str, Any]) -> Tuple[List[Ball], List, Gri
     grid = Grid(ndim, domain_size)
     
     # Check if we have enough cells for all balls
-    total_cells = 1
-    for size in domain_size:
-        total_cells *= int(size)
+    cell_counts = tuple(int(size) for size in domain_size)
+    total_cells = int(np.prod(cell_counts))
     
     if num_balls > total_cells:
         raise ValueError(f"Too many balls ({num_balls}) for domain size {domain_size} ({total_cells} cells)")
     
-    # Set random seed for reproducible results
+    # Ball state lives in contiguous (num_balls, ndim) arrays; each Ball is a view of one row
     random_seed = params.get('random_seed', 100)
-    np.random.seed(random_seed)
-    
-    # Create balls with non-overlapping positions
-    balls = []
-    for i in range(num_balls):
-        # Simple placement: center each ball in its own cell
-        if ndim == 2:
-            cell_x = i % int(domain_size[0])
-            cell_y = (i // int(domain_size[0])) % int(domain_size[1])
-            position = np.array([cell_x + 0.5, cell_y + 0.5])
-            cell = (cell_x, cell_y)
-        else:  # ndim == 3
-            cells_per_layer = int(domain_size[0]) * int(domain_size[1])
-            cell_x = i % int(domain_size[0])
-            cell_y = (i // int(domain_size[0])) % int(domain_size[1])
-            cell_z = i // cells_per_layer
-            position = np.array([cell_x + 0.5, cell_y + 0.5, cell_z + 0.5])
-            cell = (cell_x, cell_y, cell_z)
-        
-        # Random velocity from gaussian
-        velocity = np.random.normal(0.0, 1.0, ndim)
-        
-        ball = Ball(position, velocity, ball_radius, i, cell)
-        balls.append(ball)
-        
-        # Add ball to grid
-        grid.add_ball(i, cell)
+    positions, velocities, cells = _initial_ball_state(
+        num_balls, cell_counts, random_seed, params.get('legacy_rng', False)
+    )
+    
+    state = BallState(positions, velocities, np.zeros(num_balls), np.full(num_balls, ball_radius), cells)
+    balls = Ball.bind(state)
+    
+    # Add all balls to the grid at once
+    grid.add_balls(np.arange(num_balls), cells)
     
     # Create event heap
     event_heap = EventHeap()
     
     # Create output manager
-    output_manager = OutputManager(params.get('output_dir', 'runs'))
+    output_manager = OutputManager(params.get('output_dir', 'runs'), params.get('output_format', 'text'))
     
-    return balls, walls, grid, event_heap, output_manager
+    return balls, walls, grid, event_heap, output_manager, state
+
+
+def _bb_to_dict(event: BallBallCollision) -> Dict[str, Any]:
+    """Summarize a ball-ball collision for the initialization log."""
+    return {
+        "type": "BallBallCollision",
+        "time": event.time,
+        "ball1": event.ball1.index,
+        "ball2": event.ball2.index
+    }
+
+
+def _bw_to_dict(event: BallWallCollision) -> Dict[str, Any]:
+    """Summarize a ball-wall collision for the initialization log."""
+    return {
+        "type": "BallWallCollision",
+        "time": event.time,
+        "ball": event.ball.index,
+        "wall": str(event.wall)
+    }
+
+
+def _grid_to_dict(event: BallGridTransit) -> Dict[str, Any]:
+    """Summarize a grid transit for the initialization log."""
+    return {
+        "type": "BallGridTransit",
+        "time": event.time,
+        "ball": event.ball.index,
+        "from_cell": list(event.ball.cell),
+        "to_cell": list(event.new_cell)
+    }
+
+
+# Initialization log converters indexed by event KIND (ball events only)
+_INIT_EVENT_TO_DICT = (_bb_to_dict, _bw_to_dict, _grid_to_dict)
 
 
 def run_simulation(params: Dict[str, Any]) -> None:
@@ -192,6 +337,10 @@ def run_simulation(params: Dict[str, Any]) -> None:
             - output_rate: time interval for output (default 1.0)
             - run_name: name for this simulation run (default 'default')
             - output_dir: base directory for output files (default 'runs')
+            - output_format: 'text' per-frame files or 'binary' single frames.bin (default 'text')
+            - log_init: include per-ball state and events in the start log (default True)
+            - verbose: include per-ball neighbor lists in the start log (default False)
+            - progress_interval: events between progress log lines, 0 to disable (default 1000)
     """
     # Set up run-specific output directory
     run_name = params.get('run_name', 'default')
@@ -203,7 +352,7 @@ def run_simulation(params: Dict[str, Any]) -> None:
     params_with_output['output_dir'] = run_output_dir
     
     # Initialize simulation
-    balls, walls, grid, event_heap, output_manager = initialize_simulation(params_with_output)
+    balls, walls, grid, event_heap, output_manager, state = initialize_simulation(params_with_output)
     
     # Write simulation parameters to output directory
     output_manager.write_parameters(params)
@@ -215,62 +364,64 @@ def run_simulation(params: Dict[str, Any]) -> None:
     ball_restitution = params.get('ball_restitution', 1.0)
     wall_restitution = params.get('wall_restitution', 1.0)
     output_rate = params.get('output_rate', 1.0)
+    log_init = params.get('log_init', True)
+    verbose = params.get('verbose', False)
+    progress_interval = params.get('progress_interval', 1000)
     
     current_time = 0.0
     
     # Generate initial events for all balls
-    import json
-    from .event_generation import generate_ball_ball_events, generate_ball_wall_events, generate_ball_grid_event
-    
-    # Collect all initialization data
+    # Collect all initialization data; events go into the heap in one batch below
     initial_balls = []
+    initial_events = []
+    
+    # For initialization, only pair each ball with higher-indexed neighbors to prevent duplicates;
+    # the grid broad-phase emits every such pair at once
+    pairs = grid.candidate_pairs(state.cells)
+    first = pairs[:, 0].astype(np.intp)
+    second = pairs[:, 1].astype(np.intp)
+    
+    # Per-ball neighbor lists are only logged in verbose runs; pairs are sorted by first
+    # ball, so each ball's higher neighbors are a contiguous run
+    if verbose:
+        higher_neighbor_indices = np.split(second, np.cumsum(np.bincount(first, minlength=len(balls)))[:-1])
+    
+    # Compute all initial ball-ball collisions in one vectorized pass. Ball state stays
+    # float64: stored in float32, balls at contact are rounded by ~1e-6 and runs stall on
+    # a stream of events microseconds apart
+    ball_ball_events = generate_ball_ball_events_batch(
+        balls, first, second, state.positions, state.velocities, state.times, state.radii,
+        current_time, gravity
+    )
+    ball_ball_events_by_ball = [[] for _ in balls]
+    for event in ball_ball_events:
+        ball_ball_events_by_ball[event.ball1.index].append(event)
+    
+    # Compute all initial wall collisions in one vectorized pass, straight from the shared state
+    wall_events_by_ball = [[] for _ in balls]
+    for event in generate_ball_wall_events_batch(balls, walls, state.positions, state.velocities, state.times,
+                                                 state.radii, current_time, gravity):
+        wall_events_by_ball[event.ball.index].append(event)
+    
+    # Compute all initial grid transits in one vectorized pass (always in float64:
+    # cell boundaries must be resolved exactly)
+    grid_events_by_ball = [[] for _ in balls]
+    for event in generate_ball_grid_events_batch(balls, state.positions, state.velocities, state.times,
+                                                 state.cells, current_time, gravity):
+        grid_events_by_ball[event.ball.index].append(event)
     
     for ball in balls:
-        # For initialization, only pass higher-indexed balls to prevent duplicates
-        higher_indexed_balls = [b for b in balls if b.index > ball.index]
-        
-        # Get neighbor ball indices from grid
-        neighbor_ball_indices = grid.get_balls_in_neighboring_cells(ball.cell)
-        # Filter to only higher-indexed neighboring balls
-        higher_neighbor_balls = [balls[i] for i in neighbor_ball_indices if i > ball.index]
+        # Gather this ball's events from the batched passes (these do not log individually)
+        events = list(ball_ball_events_by_ball[ball.index])
+        events.extend(wall_events_by_ball[ball.index])
+        events.extend(grid_events_by_ball[ball.index])
+        initial_events.extend(events)
         
-        # Generate events for this ball (suppress individual logging during init)
-        import sys, io
-        original_stdout = sys.stdout
-        sys.stdout = io.StringIO()  # Temporarily capture output
+        if not log_init:
+            continue
         
-        events = []
-        events.extend(generate_ball_ball_events(ball, higher_neighbor_balls, current_time, ndim, gravity))
-        events.extend(generate_ball_wall_events(ball, walls, current_time, ndim, gravity))
-        events.extend(generate_ball_grid_event(ball, current_time, ndim, gravity))
-        
-        sys.stdout = original_stdout  # Restore output
-        
-        # Convert events to nested structure
-        events_created = []
-        for event in events:
-            if hasattr(event, 'ball1') and hasattr(event, 'ball2'):
-                events_created.append({
-                    "type": "BallBallCollision",
-                    "time": event.time,
-                    "ball1": event.ball1.index,
-                    "ball2": event.ball2.index
-                })
-            elif hasattr(event, 'ball') and hasattr(event, 'wall'):
-                events_created.append({
-                    "type": "BallWallCollision",
-                    "time": event.time,
-                    "ball": event.ball.index,
-                    "wall": str(event.wall)
-                })
-            elif hasattr(event, 'ball') and hasattr(event, 'new_cell'):
-                events_created.append({
-                    "type": "BallGridTransit",
-                    "time": event.time,
-                    "ball": event.ball.index,
-                    "from_cell": list(event.ball.cell),
-                    "to_cell": list(event.new_cell)
-                })
+        # Convert events to nested structure, dispatching on the event kind tag
+        events_created = [_INIT_EVENT_TO_DICT[event.KIND](event) for event in events]
         
         # Add ball data to initialization
         ball_data = {
@@ -279,14 +430,11 @@ def run_simulation(params: Dict[str, Any]) -> None:
             "position": ball.position.tolist(),
             "velocity": ball.velocity.tolist(),
             "radius": ball.radius,
-            "higher_neighbor_balls": [b.index for b in higher_neighbor_balls],
             "events_created": events_created
         }
+        if verbose:
+            ball_data["higher_neighbor_balls"] = higher_neighbor_indices[ball.index].tolist()
         initial_balls.append(ball_data)
-        
-        # Add events to heap
-        for event in events:
-            event_heap.add_event(event)
     
     # Create comprehensive initialization log
     init_log = {
@@ -303,19 +451,23 @@ def run_simulation(params: Dict[str, Any]) -> None:
             "wall_restitution": wall_restitution,
             "output_rate": output_rate
         },
-        "initial_balls": initial_balls
     }
+    if log_init:
+        init_log["initial_balls"] = initial_balls
+    else:
+        init_log["initial_event_count"] = len(initial_events)
     print(json.dumps(init_log))
     
     # Add export events (including initial condition at t=0)
-    event_heap.add_event(ExportEvent(0.0))  # Initial condition
-    export_time = output_rate
-    while export_time <= simulation_time:
-        event_heap.add_event(ExportEvent(export_time))
-        export_time += output_rate
+    initial_events.append(ExportEvent(0.0))  # Initial condition
+    for export_time in np.arange(output_rate, simulation_time + 1e-12, output_rate).tolist():
+        initial_events.append(ExportEvent(export_time))
     
     # Add end event
-    event_heap.add_event(EndEvent(simulation_time))
+    initial_events.append(EndEvent(simulation_time))
+    
+    # Build the heap from all initial events at once
+    event_heap.heapify(initial_events)
     
     # Simulation state
     simulation_state = {'should_end': False}
@@ -328,38 +480,36 @@ def run_simulation(params: Dict[str, Any]) -> None:
     print(json.dumps(start_log))
     event_count = 0
     
-    # Main event loop
-    while not event_heap.is_empty() and not simulation_state['should_end']:
-        event = event_heap.get_next_event()
-        
-        if event is None:
-            break
-        
-        current_time = event.time
-        event_count += 1
-        
-        if event_count % 1000 == 0:
-            process_log = {
-                "event_type": "ProcessingEvent",
-                "event_count": event_count,
-                "time": current_time,
-                "current_event": str(event)
-            }
-            print(json.dumps(process_log))
-        
-        # Process event based on type
-        event.process(
-            ndim=ndim,
-            gravity=gravity,
-            ball_restitution=ball_restitution,
-            wall_restitution=wall_restitution,
-            grid=grid,
-            balls=balls,
-            walls=walls,
-            output_manager=output_manager,
-            simulation_state=simulation_state,
-            event_heap=event_heap
-        )
+    # Main event loop; close the output even if an event raises so buffered frames are written
+    try:
+        while not event_heap.is_empty() and not simulation_state['should_end']:
+            event = event_heap.get_next_event()
+            
+            if event is None:
+                break
+            
+            current_time = event.time
+            event_count += 1
+            
+            if progress_interval and event_count % progress_interval == 0:
+                print(_PROGRESS_LOG_FORMAT % (event_count, float(current_time), json.dumps(str(event))))
+            
+            # Process event based on type
+            event.process(
+                ndim=ndim,
+                gravity=gravity,
+                ball_restitution=ball_restitution,
+                wall_restitution=wall_restitution,
+                grid=grid,
+                balls=balls,
+                ball_state=state,
+                walls=walls,
+                output_manager=output_manager,
+                simulation_state=simulation_state,
+                event_heap=event_heap
+            )
+    finally:
+        output_manager.close()
     
     end_log = {
         "event_type": "SimulationComplete",
@@ -12,6 +12,8 @@ class Wall:
     - coordinate: the position along that axis where the wall lies
     """
     
+    __slots__ = ('normal_axis', 'coordinate', 'restitution', '_normals')
+    
     def __init__(self, normal_axis: int, coordinate: float, restitution: float = 1.0):
         """
         Initialize a Wall.
@@ -21,9 +23,19 @@ class Wall:
             coordinate: position along normal axis where wall is located
             restitution: coefficient of restitution (1.0 = perfectly elastic)
         """
-        self.normal_axis = normal_axis
-        self.coordinate = coordinate
+        # Plain Python numbers keep the scalar physics paths free of NumPy scalar arithmetic
+        self.normal_axis = int(normal_axis)
+        self.coordinate = float(coordinate)
         self.restitution = restitution
+        
+        # Normal vectors are built once per supported dimension; read-only so callers cannot alias-modify them
+        self._normals = {}
+        for ndim in (2, 3):
+            if normal_axis < ndim:
+                normal = np.zeros(ndim)
+                normal[normal_axis] = 1.0
+                normal.flags.writeable = False
+                self._normals[ndim] = normal
     
     def get_normal_vector(self, ndim: int) -> np.ndarray:
         """
@@ -33,11 +45,9 @@ class Wall:
             ndim: number of dimensions (2 or 3)
             
         Returns:
-            unit normal vector pointing away from simulation domain
+            read-only unit normal vector pointing away from simulation domain
         """
-        normal = np.zeros(ndim)
-        normal[self.normal_axis] = 1.0
-        return normal
+        return self._normals[ndim]
     
     def distance_to_point(self, point: np.ndarray) -> float:
         """
@@ -49,7 +59,20 @@ class Wall:
         Returns:
             distance to wall (always positive)
         """
-        return abs(point[self.normal_axis] - self.coordinate)
+        return abs(float(point[self.normal_axis]) - self.coordinate)
+    
+    def distances_to_points(self, points: np.ndarray) -> np.ndarray:
+        """
+        Calculate distances from many points to wall.
+        
+        Args:
+            points: (N, ndim) position vectors
+            
+        Returns:
+            (N,) distances to wall (always positive)
+        """
+        distances = points[:, self.normal_axis] - self.coordinate
+        return np.abs(distances, out=distances)
     
     
     def __repr__(self):
@@ -58,6 +81,10 @@ class Wall:
         return f"Wall({axis_name}-normal, coord={self.coordinate}, e={self.restitution})"
 
 
+# Order in which create_box_walls emits the wall pair for each axis
+_BOX_WALL_AXES = (1, 0, 2)
+
+
 def create_box_walls(ndim: int, box_size: Tuple[float, ...], inset: float = 0.01, 
                      restitution: float = 1.0) -> list:
     """
@@ -70,33 +97,48 @@ def create_box_walls(ndim: int, box_size: Tuple[float, ...], inset: float = 0.01
         restitution: coefficient of restitution for all walls
         
     Returns:
-        list of Wall objects defining the box boundary
+        list of Wall objects defining the box boundary (see pack_walls for array form)
     """
+    if ndim not in (2, 3):
+        raise ValueError(f"Unsupported number of dimensions: {ndim}")
+    
+    # Low and high wall for each axis: bottom/top (y), left/right (x), then front/back (z)
     walls = []
+    for axis in _BOX_WALL_AXES[:ndim]:
+        walls.append(Wall(axis, inset, restitution))
+        walls.append(Wall(axis, box_size[axis] - inset, restitution))
     
-    if ndim == 2:
-        width, height = box_size[:2]
-        
-        walls.extend([
-            Wall(1, inset, restitution),  # bottom
-            Wall(1, height - inset, restitution),  # top
-            Wall(0, inset, restitution),  # left
-            Wall(0, width - inset, restitution)  # right
-        ])
-        
-    elif ndim == 3:
-        width, height, depth = box_size[:3]
-        
-        walls.extend([
-            Wall(1, inset, restitution),  # bottom
-            Wall(1, height - inset, restitution),  # top
-            Wall(0, inset, restitution),  # left
-            Wall(0, width - inset, restitution),  # right
-            Wall(2, inset, restitution),  # front
-            Wall(2, depth - inset, restitution)  # back
-        ])
+    return walls
+
+
+def pack_walls(walls: list) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Pack wall attributes into arrays for vectorized collision calculations.
+    
+    Args:
+        walls: list of Wall objects
         
-    else:
-        raise ValueError(f"Unsupported number of dimensions: {ndim}")
+    Returns:
+        (normal_axes, coordinates, restitutions) arrays, one entry per wall
+    """
+    normal_axes = np.array([wall.normal_axis for wall in walls], dtype=np.intp)
+    coordinates = np.array([wall.coordinate for wall in walls], dtype=float)
+    restitutions = np.array([wall.restitution for wall in walls], dtype=float)
+    return normal_axes, coordinates, restitutions
+
+
+def wall_distances(points: np.ndarray, normal_axes: np.ndarray, coordinates: np.ndarray) -> np.ndarray:
+    """
+    Calculate distances from every point to every wall in one pass.
     
-    return walls
\ No newline at end of file
+    Args:
+        points: (N, ndim) position vectors
+        normal_axes: (W,) normal axis of each wall (see pack_walls)
+        coordinates: (W,) coordinate of each wall along its normal axis
+        
+    Returns:
+        (N, W) distances, entry [i, j] is the distance from point i to wall j
+    """
+    # The subtraction allocates the result once; abs then runs in place on it
+    distances = points[:, normal_axes] - coordinates
+    return np.abs(distances, out=distances)
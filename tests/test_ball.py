@@ -1,6 +1,7 @@
 import numpy as np
 import pytest
-from src.ball import Ball
+from src.ball import Ball, BallState
+from src.events import BallBallCollision, BallGridTransit
 
 
 class TestBall:
@@ -38,6 +39,48 @@ class TestBall:
         assert ball.cell == cell
         assert ball.time == time
     
+    def test_bind_shares_state_arrays(self):
+        """Test that bound balls are row views of the shared state arrays."""
+        positions = np.array([[0.5, 0.5], [1.5, 0.5]])
+        velocities = np.array([[1.0, 0.0], [0.0, -1.0]])
+        state = BallState(positions, velocities, np.zeros(2), np.full(2, 0.1), np.array([[0, 0], [1, 0]]))
+        
+        balls = Ball.bind(state)
+        
+        assert [ball.index for ball in balls] == [0, 1]
+        assert [ball.cell for ball in balls] == [(0, 0), (1, 0)]
+        assert [ball.radius for ball in balls] == [0.1, 0.1]
+        balls[1].update_to_time(2.0, ndim=2, gravity=False)
+        np.testing.assert_array_equal(positions[1], [1.5, -1.5])
+        np.testing.assert_array_equal(state.times, [0.0, 2.0])
+        balls[1].set_cell((1, 1))
+        np.testing.assert_array_equal(state.cells, [[0, 0], [1, 1]])
+        velocities[0, 1] = 2.0
+        np.testing.assert_array_equal(balls[0].velocity, [1.0, 2.0])
+    
+    def test_copy(self):
+        """Test that a copy has the same state in independent arrays and no events."""
+        ball = Ball(np.array([1.0, 2.0]), np.array([0.5, -0.3]), 0.1, 4, (1, 2), time=1.5)
+        BallGridTransit(2.0, ball, (2, 2))
+        
+        clone = ball.copy()
+        
+        np.testing.assert_array_equal(clone.position, ball.position)
+        np.testing.assert_array_equal(clone.velocity, ball.velocity)
+        assert (clone.radius, clone.index, clone.cell, clone.time) == (0.1, 4, (1, 2), 1.5)
+        assert clone.events == []
+        clone.velocity[0] = 9.0
+        assert ball.velocity[0] == 0.5
+    
+    def test_integer_input_is_stored_as_float(self):
+        """Test that integer arrays are copied as floats so in-place updates do not fail or truncate."""
+        ball = Ball(np.array([1, 1]), np.array([1, 0]), 0.1, 0, (1, 1))
+        
+        assert ball.position.dtype == np.float64 and ball.velocity.dtype == np.float64
+        ball.update_to_time(0.5, ndim=2, gravity=True)
+        np.testing.assert_array_equal(ball.position, [1.5, 0.875])
+        np.testing.assert_array_equal(ball.velocity, [1.0, -0.5])
+    
     def test_position_independence(self):
         """Test that ball stores independent copies of position and velocity."""
         original_pos = np.array([1.0, 2.0])
@@ -53,6 +96,21 @@ class TestBall:
         assert ball.position[0] == 1.0
         assert ball.velocity[0] == 0.5
     
+    def test_shared_state_views(self):
+        """Test that balls created with copy=False stay in sync with shared state arrays."""
+        positions = np.array([[1.0, 2.0], [3.0, 4.0]])
+        velocities = np.array([[0.5, -0.3], [0.0, 1.0]])
+        
+        balls = [Ball(positions[i], velocities[i], 0.1, i, (i, 0), copy=False) for i in range(2)]
+        
+        balls[1].update_to_time(2.0, ndim=2, gravity=True)
+        balls[0].velocity[0] = -0.5
+        
+        np.testing.assert_array_almost_equal(positions[1], [3.0, 4.0])
+        np.testing.assert_array_almost_equal(velocities[1], [0.0, -1.0])
+        assert velocities[0, 0] == -0.5
+        assert balls[1].position.base is positions
+    
     def test_get_position_and_velocity_at_time_no_gravity(self):
         """Test position and velocity calculation at future time without gravity."""
         position = np.array([1.0, 2.0])
@@ -117,6 +175,45 @@ class TestBall:
         with pytest.raises(ValueError, match="Cannot get position/velocity at time 3.0 before ball's current time 5.0"):
             ball.get_position_and_velocity_at_time(3.0, ndim=2)
     
+    @pytest.mark.parametrize("gravity", [False, True])
+    def test_get_state_at_time_matches_arrays(self, gravity):
+        """Test that the scalar state matches the array version, including at the ball's own time."""
+        ball = Ball(np.array([1.0, 2.0, 3.0]), np.array([0.5, -0.3, 0.2]), 0.1, 0, (1, 2, 3), time=1.0)
+        
+        for t in (1.0, 1.75):
+            position, velocity = ball.get_state_at_time(t, 3, gravity)
+            expected_pos, expected_vel = ball.get_position_and_velocity_at_time(t, 3, gravity)
+            
+            assert isinstance(position, list) and isinstance(velocity, list)
+            assert position == expected_pos.tolist()
+            assert velocity == expected_vel.tolist()
+        
+        with pytest.raises(ValueError, match="Cannot get position/velocity at time 0.5"):
+            ball.get_state_at_time(0.5, 3, gravity)
+    
+    @pytest.mark.parametrize("dtype", [np.float64, np.float32])
+    @pytest.mark.parametrize("gravity", [False, True])
+    def test_state_at_time_matches_per_ball(self, dtype, gravity):
+        """Test that the batched states equal the per-ball calculation exactly."""
+        rng = np.random.default_rng(3)
+        balls = [
+            Ball(rng.uniform(0, 5, 3).astype(dtype), rng.uniform(-1, 1, 3).astype(dtype), 0.1, i, (0, 0, 0),
+                 time=float(rng.uniform(0, 1)))
+            for i in range(6)
+        ]
+        
+        state = BallState.from_balls(balls)
+        positions, velocities = state.at_time(1.5, 3, gravity)
+        
+        assert positions.dtype == dtype and velocities.dtype == dtype
+        for ball, position, velocity in zip(balls, positions, velocities):
+            expected_pos, expected_vel = ball.get_position_and_velocity_at_time(1.5, 3, gravity)
+            np.testing.assert_array_equal(position, expected_pos)
+            np.testing.assert_array_equal(velocity, expected_vel)
+        
+        with pytest.raises(ValueError, match="Cannot get position/velocity at time 0.5"):
+            state.at_time(0.5, 3, gravity)
+    
     def test_update_to_time_no_gravity(self):
         """Test updating ball to future time without gravity."""
         position = np.array([1.0, 2.0])
@@ -162,22 +259,23 @@ class TestBall:
     def test_invalidate_all_events(self):
         """Test event invalidation."""
         ball = Ball(np.array([1.0, 2.0]), np.array([0.5, -0.3]), 0.1, 0, (1, 2))
+        other = Ball(np.array([2.0, 2.0]), np.array([-0.5, 0.0]), 0.1, 1, (2, 2))
         
-        # Create mock events
-        class MockEvent:
-            def __init__(self):
-                self.valid = True
-        
-        event1 = MockEvent()
-        event2 = MockEvent()
-        
-        ball.events = [event1, event2]
+        event1 = BallBallCollision(1.0, ball, other)
+        event2 = BallGridTransit(2.0, ball, (2, 2))
+        other_event = BallGridTransit(3.0, other, (1, 2))
         
         ball.invalidate_all_events()
         
         assert not event1.valid
         assert not event2.valid
         assert len(ball.events) == 0
+        
+        # Events that do not involve the ball are unaffected
+        assert other_event.valid
+        
+        # Events created after invalidation are valid again
+        assert BallGridTransit(4.0, ball, (2, 2)).valid
     
     def test_add_event(self):
         """Test adding events to ball."""
@@ -13,6 +13,12 @@ from src.grid import Grid
 from src.events import BallBallCollision, BallWallCollision, BallGridTransit
 
 
+@pytest.fixture(scope="module")
+def walls():
+    """Walls of the 3 x 2 box shared by these tests; walls are never modified."""
+    return create_box_walls(2, (3.0, 2.0), 0.01, 1.0)
+
+
 class TestEventGeneration:
     
     def test_generate_ball_ball_events_collision(self):
@@ -60,10 +66,9 @@ class TestEventGeneration:
         events = generate_ball_ball_events(ball1, [ball1], 0.0, 2, False)
         assert len(events) == 0
     
-    def test_generate_ball_wall_events(self):
+    def test_generate_ball_wall_events(self, walls):
         # Ball moving toward wall
         ball = Ball(np.array([0.5, 1.0]), np.array([-1.0, 0.0]), 0.1, 0, (0, 1))
-        walls = create_box_walls(2, (3.0, 2.0), 0.01, 1.0)
         
         events = generate_ball_wall_events(ball, walls, 0.0, 2, False)
         
@@ -72,10 +77,9 @@ class TestEventGeneration:
         assert len(wall_events) >= 1
         assert all(e.time > 0.0 for e in wall_events)
     
-    def test_generate_ball_wall_events_no_collision(self):
+    def test_generate_ball_wall_events_no_collision(self, walls):
         # Ball moving parallel to walls
         ball = Ball(np.array([1.0, 1.0]), np.array([0.0, 1.0]), 0.1, 0, (1, 1))
-        walls = create_box_walls(2, (3.0, 2.0), 0.01, 1.0)
         
         events = generate_ball_wall_events(ball, walls, 0.0, 2, False)
         
@@ -103,7 +107,7 @@ class TestEventGeneration:
         
         assert len(events) == 0
     
-    def test_generate_events_for_ball(self):
+    def test_generate_events_for_ball(self, walls):
         # Set up simulation components
         grid = Grid(2, (3.0, 2.0))
         
@@ -115,8 +119,6 @@ class TestEventGeneration:
         grid.add_ball(0, (1, 1))
         grid.add_ball(1, (2, 1))
         
-        walls = create_box_walls(2, (3.0, 2.0), 0.01, 1.0)
-        
         events = generate_events_for_ball(ball1, balls, walls, grid, 0.0, 2, False)
         
         # Should have ball-ball, ball-wall, and ball-grid events
@@ -128,6 +130,20 @@ class TestEventGeneration:
         assert len(ball_wall_events) >= 1  # Collision with walls
         assert len(ball_grid_events) >= 1  # Grid transit
     
+    def test_generate_events_for_ball_without_logging(self, capsys, walls):
+        grid = Grid(2, (3.0, 2.0))
+        
+        ball1 = Ball(np.array([1.5, 1.0]), np.array([1.0, 0.0]), 0.1, 0, (1, 1))
+        ball2 = Ball(np.array([2.5, 1.0]), np.array([-1.0, 0.0]), 0.1, 1, (2, 1))
+        grid.add_ball(0, (1, 1))
+        grid.add_ball(1, (2, 1))
+        
+        events = generate_events_for_ball(ball1, [ball1, ball2], walls, grid, 0.0, 2, False, log_events=False)
+        
+        # Same events are generated, but nothing is printed
+        assert len(events) >= 3
+        assert capsys.readouterr().out == ""
+    
     def test_generate_ball_ball_events_for_new_cell(self):
         # Set up grid and balls
         grid = Grid(2, (4.0, 3.0))
@@ -160,10 +176,9 @@ class TestEventGeneration:
         assert 1 in new_neighbors  # ball2 should be in new neighbors
         assert 2 not in new_neighbors  # ball3 should not be in new neighbors
     
-    def test_generate_events_with_gravity(self):
+    def test_generate_events_with_gravity(self, walls):
         # Test event generation with gravity enabled
         ball = Ball(np.array([1.0, 1.5]), np.array([0.0, 1.0]), 0.1, 0, (1, 1))
-        walls = create_box_walls(2, (3.0, 2.0), 0.01, 1.0)
         
         events = generate_ball_wall_events(ball, walls, 0.0, 2, True)
         
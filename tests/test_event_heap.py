@@ -1,3 +1,4 @@
+import json
 import numpy as np
 import pytest
 from src.event_heap import EventHeap
@@ -52,6 +53,16 @@ class TestEventHeap:
         assert heap.get_next_event().time == 15.0
         assert heap.is_empty()
     
+    def test_heapify(self):
+        heap = EventHeap()
+        heap.add_event(ExportEvent(7.5))
+        
+        heap.heapify([ExportEvent(10.0), ExportEvent(5.0), EndEvent(15.0)])
+        
+        assert heap.size() == 4
+        assert [heap.get_next_event().time for _ in range(4)] == [5.0, 7.5, 10.0, 15.0]
+        assert heap.is_empty()
+    
     def test_invalid_event_filtering(self):
         heap = EventHeap()
         
@@ -135,6 +146,35 @@ class TestEventHeap:
         assert all(event.time == 5.0 for event in events)
         assert set(events) == {event1, event2, event3}
     
+    def test_same_time_events_pop_in_insertion_order(self):
+        heap = EventHeap()
+        
+        first = ExportEvent(5.0)
+        heap.add_event(first)
+        batch = [ExportEvent(5.0), EndEvent(5.0)]
+        heap.heapify(batch)
+        last = ExportEvent(5.0)
+        heap.add_event(last)
+        
+        assert [heap.get_next_event() for _ in range(4)] == [first] + batch + [last]
+    
+    def test_compaction_when_mostly_invalid(self, capsys):
+        heap = EventHeap()
+        
+        events = [ExportEvent(float(t)) for t in range(5)]
+        heap.heapify(events)
+        for event in events[1:4]:
+            event.valid = False
+        heap.note_invalidated(3)
+        
+        # Compaction removes all invalid entries before the first pop and logs one
+        # summary line instead of an EventDiscarded line per entry
+        assert heap.get_next_event() is events[0]
+        assert heap.size() == 1
+        assert heap.get_next_event() is events[4]
+        logs = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert logs == [{"event_type": "HeapCompacted", "time": 0.0, "discarded": 3}]
+    
     def test_heap_after_invalidation(self):
         heap = EventHeap()
         
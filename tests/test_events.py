@@ -1,11 +1,13 @@
 import numpy as np
 import pytest
 from unittest.mock import Mock, MagicMock, patch
-from src.ball import Ball
+from src.ball import Ball, BallState
 from src.events import (
     Event, BallBallCollision, BallWallCollision, 
-    BallGridTransit, ExportEvent, EndEvent
+    BallGridTransit, ExportEvent, EndEvent,
+    KIND_BALL_BALL, KIND_BALL_WALL, KIND_GRID, KIND_EXPORT, KIND_END
 )
+from src.simulation import OutputManager, read_binary_frames
 
 
 class MockEvent(Event):
@@ -47,6 +49,14 @@ class TestEventBase:
         assert "MockEvent" in repr_str
         assert "t=2.5" in repr_str
         assert "valid=True" in repr_str
+    
+    def test_event_kinds(self):
+        """Test that each event class carries a distinct integer kind tag."""
+        kinds = [BallBallCollision.KIND, BallWallCollision.KIND, BallGridTransit.KIND,
+                 ExportEvent.KIND, EndEvent.KIND]
+        
+        assert kinds == [KIND_BALL_BALL, KIND_BALL_WALL, KIND_GRID, KIND_EXPORT, KIND_END]
+        assert len(set(kinds)) == 5
 
 
 class TestBallBallCollision:
@@ -86,15 +96,11 @@ class TestBallBallCollision:
         collision = BallBallCollision(3.0, ball1, ball2)
         
         # Mock dependencies
-        mock_physics = Mock()
         mock_event_heap = Mock()
         mock_grid = Mock()
         mock_grid.get_balls_in_neighboring_cells.return_value = [0, 1]  # Return ball indices
         
-        # Mock the physics imports
-        with patch.dict('sys.modules', {'src.physics': mock_physics}):
-            mock_physics.perform_ball_ball_collision = Mock()
-            
+        with patch('src.events.perform_ball_ball_collision') as mock_collide:
             # Mock event generation functions to avoid calling real physics
             with patch('src.event_generation.generate_events_for_ball') as mock_generate:
                 # Create proper mock events with required attributes
@@ -120,7 +126,7 @@ class TestBallBallCollision:
         assert ball2.time == 3.0
         
         # Check that collision was performed
-        mock_physics.perform_ball_ball_collision.assert_called_once_with(ball1, ball2, 1.0)
+        mock_collide.assert_called_once_with(ball1, ball2, 1.0)
         
         # Check that events were generated for both balls
         assert mock_generate.call_count == 2
@@ -165,14 +171,11 @@ class TestBallWallCollision:
         collision = BallWallCollision(3.0, ball, wall)
         
         # Mock dependencies
-        mock_physics = Mock()
         mock_event_heap = Mock()
         mock_grid = Mock()
         mock_grid.get_balls_in_neighboring_cells.return_value = [0]  # Return ball index
         
-        with patch.dict('sys.modules', {'src.physics': mock_physics}):
-            mock_physics.perform_ball_wall_collision = Mock()
-            
+        with patch('src.events.perform_ball_wall_collision') as mock_collide:
             # Mock event generation functions to avoid calling real physics
             with patch('src.event_generation.generate_events_for_ball') as mock_generate:
                 # Create proper mock events with required attributes
@@ -197,7 +200,7 @@ class TestBallWallCollision:
         assert ball.time == 3.0
         
         # Check that collision was performed
-        mock_physics.perform_ball_wall_collision.assert_called_once_with(ball, wall, 1.0)
+        mock_collide.assert_called_once_with(ball, wall, 1.0)
         
         # Check that events were generated for ball
         mock_generate.assert_called_once()
@@ -272,10 +275,10 @@ class TestBallGridTransit:
         mock_grid.move_ball.assert_called_once_with(ball.index, old_cell, new_cell)
         
         # Check that new ball-ball events were generated
-        mock_generate.assert_called_once_with(ball, old_cell, [ball], mock_grid, 2.5, 2, False)
+        mock_generate.assert_called_once_with(ball, old_cell, [ball], mock_grid, 2.5, 2, False, log_events=False)
         
         # Check that new grid events were generated
-        mock_grid_gen.assert_called_once_with(ball, 2.5, 2, False)
+        mock_grid_gen.assert_called_once_with(ball, 2.5, 2, False, log_events=False)
         
         # Check that 2 events were added to heap (ball-ball + grid)
         assert mock_event_heap.add_event.call_count == 2
@@ -330,6 +333,29 @@ class TestExportEvent:
         assert len(velocities) == 2
         np.testing.assert_array_equal(velocities[0], ball1.velocity)
         np.testing.assert_array_equal(velocities[1], ball2.velocity)
+    
+    @pytest.mark.parametrize("gravity", [False, True])
+    def test_process_with_shared_state(self, tmp_path, gravity):
+        """Test that exporting from the shared state matches the per-ball calculation."""
+        positions = np.array([[1.0, 2.0], [3.0, 4.0]])
+        velocities = np.array([[0.5, -0.3], [-0.2, 0.4]])
+        state = BallState(positions, velocities, np.zeros(2), np.full(2, 0.1), np.array([[1, 2], [3, 4]]))
+        balls = Ball.bind(state)
+        balls[0].update_to_time(0.5, 2, gravity)
+        output_manager = OutputManager(str(tmp_path), output_format='binary')
+        
+        ExportEvent(1.5).process(balls=balls, ball_state=state, output_manager=output_manager,
+                                 ndim=2, gravity=gravity)
+        output_manager.close()
+        
+        (time, exported_pos, exported_vel), = read_binary_frames(str(tmp_path / 'frames.bin'))
+        assert time == 1.5
+        for ball, position, velocity in zip(balls, exported_pos, exported_vel):
+            expected_pos, expected_vel = ball.get_position_and_velocity_at_time(1.5, 2, gravity)
+            np.testing.assert_allclose(position, expected_pos, rtol=1e-6)
+            np.testing.assert_allclose(velocity, expected_vel, rtol=1e-6)
+        # Exporting does not advance the stored state
+        np.testing.assert_array_equal(state.times, [0.5, 0.0])
 
 
 class TestEndEvent:
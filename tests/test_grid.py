@@ -125,6 +125,58 @@ class TestGrid:
         expected = {0, 1, 2, 3, 4, 5, 6}
         assert set(neighbors) == expected
     
+    @pytest.mark.parametrize("ndim", [2, 3])
+    def test_linear_index_round_trip(self, ndim):
+        grid = Grid(ndim, (4.0, 3.0, 2.5)[:ndim])
+        
+        for index, cell in enumerate(np.ndindex(*grid.num_cells)):
+            assert grid.linear_index(cell) == index
+            assert grid.cell_from_linear(index) == cell
+    
+    @pytest.mark.parametrize("ndim", [2, 3])
+    def test_add_balls_matches_add_ball(self, ndim):
+        domain_size = (5.0, 4.0, 3.0)[:ndim]
+        rng = np.random.default_rng(2)
+        cells = np.stack([rng.integers(0, int(n), 30) for n in domain_size], axis=1)
+        
+        expected = Grid(ndim, domain_size)
+        for i, cell in enumerate(cells):
+            expected.add_ball(i, tuple(int(c) for c in cell))
+        
+        grid = Grid(ndim, domain_size)
+        grid.add_balls(np.arange(len(cells)), cells)
+        
+        assert grid.cells == expected.cells
+    
+    @pytest.mark.parametrize("ndim", [2, 3])
+    def test_neighboring_cells_at_every_cell(self, ndim):
+        grid = Grid(ndim, (4.0, 3.0, 2.5)[:ndim])
+        rng = np.random.default_rng(3)
+        cells = np.stack([rng.integers(0, n, 25) for n in grid.num_cells], axis=1)
+        for i, cell in enumerate(cells):
+            grid.add_ball(i, tuple(int(c) for c in cell))
+        
+        # Including edge and corner cells, neighbors are the balls within one cell on every axis
+        for cell in np.ndindex(*grid.num_cells):
+            expected = np.flatnonzero(np.all(np.abs(cells - cell) <= 1, axis=1))
+            assert sorted(grid.get_balls_in_neighboring_cells(cell)) == expected.tolist()
+    
+    @pytest.mark.parametrize("ndim", [2, 3])
+    def test_candidate_pairs_match_neighbor_lookup(self, ndim):
+        grid = Grid(ndim, (5.0, 4.0, 3.0)[:ndim])
+        rng = np.random.default_rng(1)
+        cells = np.stack([rng.integers(0, n, 40) for n in grid.num_cells], axis=1)
+        for i, cell in enumerate(cells):
+            grid.add_ball(i, tuple(int(c) for c in cell))
+        
+        pairs = grid.candidate_pairs(cells)
+        
+        expected = sorted((i, j) for i in range(len(cells))
+                          for j in grid.get_balls_in_neighboring_cells(tuple(int(c) for c in cells[i]))
+                          if j > i)
+        assert pairs.dtype == np.int32
+        assert [tuple(pair) for pair in pairs.tolist()] == expected
+    
     def test_get_balls_in_new_neighbor_cells_2d(self):
         grid = Grid(2, (5.0, 3.0))
         
@@ -15,7 +15,7 @@ def test_overlapping_balls_from_go_py():
         'output_rate': 0.1
     }
     
-    balls, walls, grid, event_heap, output_manager = initialize_simulation(params)
+    balls, walls, grid, event_heap, output_manager, state = initialize_simulation(params)
     
     # Print ball positions and distances for debugging
     print(f"Ball positions and radii (radius={params['ball_radius']}):")
@@ -1,11 +1,16 @@
 import numpy as np
 import pytest
 from src.ball import Ball
-from src.wall import Wall
+from src.wall import Wall, create_box_walls, pack_walls
 from src.physics import (
     calculate_ball_ball_collision_time,
+    calculate_ball_ball_collision_times,
     calculate_ball_wall_collision_time,
+    calculate_ball_walls_collision_times,
+    calculate_ball_wall_collision_times,
     calculate_ball_grid_transit_time,
+    calculate_ball_grid_transit_times,
+    find_overlapping_pair,
     perform_ball_ball_collision,
     perform_ball_wall_collision
 )
@@ -20,38 +25,47 @@ def validate_collision_physics(ball1_before, ball2_before, ball1_after, ball2_af
         ball1_after, ball2_after: Ball objects after collision  
         restitution: coefficient of restitution (1.0 for elastic)
     """
-    # Calculate relative position and velocity vectors
+    # Velocities as rows: ball1/ball2 before, ball1/ball2 after
+    velocities = np.stack([ball1_before.velocity, ball2_before.velocity,
+                           ball1_after.velocity, ball2_after.velocity])
+    
+    # Unit vector along the relative position
     r = ball1_before.position - ball2_before.position
-    v_rel_before = ball1_before.velocity - ball2_before.velocity
-    v_rel_after = ball1_after.velocity - ball2_after.velocity
+    r_unit = r / np.sqrt(r @ r)
     
-    # Normalize relative position vector
-    r_unit = r / np.linalg.norm(r)
+    # Relative velocity along r before and after, from one product of all four velocities
+    along = velocities @ r_unit
+    r_dot_v_before = along[0] - along[1]
+    r_dot_v_after = along[2] - along[3]
     
     # Pre-collision check: r·v < 0 (balls approaching)
-    r_dot_v_before = np.dot(r_unit, v_rel_before)
     assert r_dot_v_before < 0, f"Pre-collision: balls not approaching, r·v = {r_dot_v_before:.6f}"
     
     # Post-collision check: r·v > 0 (balls separating) 
-    r_dot_v_after = np.dot(r_unit, v_rel_after)
     assert r_dot_v_after > 0, f"Post-collision: balls not separating, r·v = {r_dot_v_after:.6f}"
     
     # Conservation of momentum (vector-wise)
-    momentum_before = ball1_before.velocity + ball2_before.velocity
-    momentum_after = ball1_after.velocity + ball2_after.velocity
-    momentum_diff = np.linalg.norm(momentum_after - momentum_before)
+    momentum_change = velocities[2] + velocities[3] - velocities[0] - velocities[1]
+    momentum_diff = np.sqrt(momentum_change @ momentum_change)
     assert momentum_diff < 1e-10, f"Momentum not conserved: diff = {momentum_diff:.2e}"
     
     # Conservation of energy (for e=1)
     if abs(restitution - 1.0) < 1e-10:
-        ke_before = 0.5 * (np.dot(ball1_before.velocity, ball1_before.velocity) + 
-                          np.dot(ball2_before.velocity, ball2_before.velocity))
-        ke_after = 0.5 * (np.dot(ball1_after.velocity, ball1_after.velocity) + 
-                         np.dot(ball2_after.velocity, ball2_after.velocity))
-        energy_diff = abs(ke_after - ke_before)
+        speeds_sq = np.einsum('ij,ij->i', velocities, velocities)
+        energy_diff = abs(0.5 * (speeds_sq[2] + speeds_sq[3] - speeds_sq[0] - speeds_sq[1]))
         assert energy_diff < 1e-10, f"Energy not conserved: diff = {energy_diff:.2e}"
 
 
+# Ball-ball scenarios from TestCalculateBallBallCollisionTime as rows of
+# (x1, y1, vx1, vy1, x2, y2, vx2, vy2, expected time); inf means no collision
+BALL_BALL_SCENARIOS = np.array([
+    [1.0, 2.0, 1.0, 0.0, 4.0, 2.0, -1.0, 0.0, 1.0],      # head on
+    [1.0, 2.0, -1.0, 0.0, 4.0, 2.0, 1.0, 0.0, np.inf],   # moving apart
+    [1.0, 2.0, 1.0, 0.0, 1.0, 4.0, 1.0, 0.0, np.inf],    # parallel
+    [1.0, 2.0, 0.0, 0.0, 4.0, 2.0, 0.0, 0.0, np.inf],    # stationary
+])
+
+
 class TestCalculateBallBallCollisionTime:
     def test_head_on_collision_2d(self):
         """Test head-on collision between two balls."""
@@ -117,6 +131,89 @@ class TestCalculateBallBallCollisionTime:
         assert collision_time == pytest.approx(1.0)
 
 
+class TestCalculateBallBallCollisionTimes:
+    def _random_balls(self, ndim, num_balls=12):
+        rng = np.random.default_rng(7)
+        return [Ball(rng.uniform(0.0, 4.0, ndim), rng.standard_normal(ndim), 0.3, i, (0,) * ndim)
+                for i in range(num_balls)]
+    
+    @pytest.mark.parametrize("ndim,gravity", [(2, False), (2, True), (3, True)])
+    def test_matches_pairwise_calculation(self, ndim, gravity):
+        """Batched collision times agree with the per-pair calculation."""
+        balls = self._random_balls(ndim)
+        first, second = np.triu_indices(len(balls), k=1)
+        
+        times = calculate_ball_ball_collision_times(
+            np.stack([b.position for b in balls]), np.stack([b.velocity for b in balls]),
+            np.zeros(len(balls)), np.full(len(balls), 0.3), first, second, 0.0, gravity
+        )
+        
+        for i, j, t in zip(first, second, times):
+            expected = calculate_ball_ball_collision_time(balls[i], balls[j], 0.0, ndim, gravity)
+            if expected is None:
+                assert t == np.inf
+            else:
+                assert t == pytest.approx(expected)
+    
+    @pytest.mark.parametrize("gravity", [False, True])
+    def test_scenario_table(self, gravity):
+        """The batched calculation reproduces the scalar test scenarios in one call."""
+        rows = BALL_BALL_SCENARIOS
+        count = len(rows)
+        positions = np.concatenate([rows[:, 0:2], rows[:, 4:6]])
+        velocities = np.concatenate([rows[:, 2:4], rows[:, 6:8]])
+        
+        times = calculate_ball_ball_collision_times(
+            positions, velocities, np.zeros(2 * count), np.full(2 * count, 0.5),
+            np.arange(count), np.arange(count, 2 * count), 0.0, gravity
+        )
+        
+        np.testing.assert_allclose(times, rows[:, 8])
+    
+    def test_float32_state(self):
+        """Float32 state arrays give float64 results close to the float64 calculation."""
+        balls = self._random_balls(2)
+        first, second = np.triu_indices(len(balls), k=1)
+        positions = np.stack([b.position for b in balls])
+        velocities = np.stack([b.velocity for b in balls])
+        times = np.zeros(len(balls))
+        radii = np.full(len(balls), 0.3)
+        
+        reference = calculate_ball_ball_collision_times(
+            positions, velocities, times, radii, first, second, 0.0)
+        reduced = calculate_ball_ball_collision_times(
+            positions.astype(np.float32), velocities.astype(np.float32),
+            times.astype(np.float32), radii.astype(np.float32), first, second, 0.0)
+        
+        assert reduced.dtype == np.float64
+        assert np.any(np.isfinite(reference))
+        assert np.array_equal(np.isfinite(reduced), np.isfinite(reference))
+        finite = np.isfinite(reference)
+        assert np.allclose(reduced[finite], reference[finite], rtol=1e-4, atol=1e-5)
+    
+    def test_float32_state_with_float64_times(self):
+        """Float32 state propagated from float64 timestamps matches the float64 calculation."""
+        balls = self._random_balls(2)
+        first, second = np.triu_indices(len(balls), k=1)
+        positions = np.stack([b.position for b in balls])
+        velocities = np.stack([b.velocity for b in balls])
+        times = np.full(len(balls), 1000.0)
+        radii = np.full(len(balls), 0.3)
+        current_time = 1000.25
+        
+        reference = calculate_ball_ball_collision_times(
+            positions, velocities, times, radii, first, second, current_time, gravity=True)
+        reduced = calculate_ball_ball_collision_times(
+            positions.astype(np.float32), velocities.astype(np.float32),
+            times, radii.astype(np.float32), first, second, current_time, gravity=True)
+        
+        assert reduced.dtype == np.float64
+        assert np.any(np.isfinite(reference))
+        assert np.array_equal(np.isfinite(reduced), np.isfinite(reference))
+        finite = np.isfinite(reference)
+        assert np.allclose(reduced[finite], reference[finite], rtol=1e-6, atol=1e-4)
+
+
 class TestCalculateBallWallCollisionTime:
     def test_ball_approaching_vertical_wall(self):
         """Test ball approaching a vertical wall."""
@@ -213,6 +310,17 @@ class TestCalculateBallWallCollisionTime:
         
         # Gravity doesn't affect x-motion: (4.0 - 0.2 - 1.0) / 1.5 = 2.8 / 1.5
         assert collision_time == pytest.approx(2.8 / 1.5)
+    
+    def test_all_walls_at_once(self):
+        """Test one ball against every box wall in a single call."""
+        ball = Ball(np.array([1.0, 2.0]), np.array([2.0, 0.0]), 0.3, 0, (1, 2), time=0.5)
+        walls = create_box_walls(2, (6.0, 4.0), inset=0.0)  # bottom, top, left, right
+        
+        collision_times = calculate_ball_walls_collision_times(ball, walls, 1.0, 2, gravity=False)
+        
+        # Only the right wall is hit: the ball is at x=2.0 at t=1.0, (6.0 - 0.3 - 2.0) / 2.0 = 1.85 later
+        assert collision_times[:3] == [None, None, None]
+        assert collision_times[3] == pytest.approx(2.85)
 
 
 class TestCalculateBallGridTransitTime:
@@ -301,6 +409,90 @@ class TestCalculateBallGridTransitTime:
         assert new_cell == (1, 1)  # Moving down to cell below
 
 
+class TestCalculateBallWallCollisionTimes:
+    @pytest.mark.parametrize("ndim,gravity", [(2, False), (2, True), (3, True)])
+    def test_matches_per_wall_calculation(self, ndim, gravity):
+        """Batched wall collision times agree with the per-ball, per-wall calculation."""
+        rng = np.random.default_rng(5)
+        walls = create_box_walls(ndim, (4.0,) * ndim)
+        balls = [Ball(rng.uniform(0.5, 3.5, ndim), rng.standard_normal(ndim), 0.3, i, (0,) * ndim,
+                      time=rng.uniform(0.0, 0.5)) for i in range(15)]
+        balls[0].velocity[:] = 0.0
+        wall_axes, wall_coordinates, _ = pack_walls(walls)
+        
+        times = calculate_ball_wall_collision_times(
+            np.stack([b.position for b in balls]), np.stack([b.velocity for b in balls]),
+            np.array([b.time for b in balls]), np.full(len(balls), 0.3),
+            wall_axes, wall_coordinates, 0.5, gravity
+        )
+        
+        assert times.shape == (len(balls), len(walls))
+        for k, ball in enumerate(balls):
+            for w, wall in enumerate(walls):
+                expected = calculate_ball_wall_collision_time(ball, wall, 0.5, ndim, gravity)
+                if expected is None:
+                    assert times[k, w] == np.inf
+                else:
+                    assert times[k, w] == pytest.approx(expected)
+
+
+class TestCalculateBallGridTransitTimes:
+    @pytest.mark.parametrize("ndim,gravity", [(2, False), (2, True), (3, True)])
+    def test_matches_per_ball_calculation(self, ndim, gravity):
+        """Batched transits agree with the per-ball calculation, including the chosen cell."""
+        rng = np.random.default_rng(3)
+        balls = []
+        for i in range(20):
+            cell = tuple(int(c) for c in rng.integers(0, 4, ndim))
+            position = np.array(cell) + rng.uniform(0.1, 0.9, ndim)
+            balls.append(Ball(position, rng.standard_normal(ndim), 0.3, i, cell, time=rng.uniform(0.0, 0.5)))
+        balls[0].velocity[:] = 0.0  # stationary ball (never leaves without gravity)
+        
+        transit_times, axes, deltas = calculate_ball_grid_transit_times(
+            np.stack([b.position for b in balls]), np.stack([b.velocity for b in balls]),
+            np.array([b.time for b in balls]), np.array([b.cell for b in balls]), 0.5, 1.0, gravity
+        )
+        
+        for ball, t, axis, delta in zip(balls, transit_times, axes, deltas):
+            expected = calculate_ball_grid_transit_time(ball, 0.5, ndim, 1.0, gravity)
+            if expected is None:
+                assert t == np.inf
+            else:
+                assert t == pytest.approx(expected[0])
+                new_cell = list(ball.cell)
+                new_cell[axis] += delta
+                assert tuple(new_cell) == expected[1]
+
+
+class TestFindOverlappingPair:
+    def test_no_overlap(self):
+        """Balls centered in separate cells do not overlap."""
+        positions = np.array([[0.5, 0.5], [1.5, 0.5], [0.5, 1.5]])
+        assert find_overlapping_pair(positions, np.full(3, 0.45)) is None
+    
+    def test_first_overlapping_pair(self):
+        """The first overlapping pair in (i, j) order is reported with its distance."""
+        positions = np.array([[0.5, 0.5], [2.5, 0.5], [3.0, 0.5], [0.9, 0.8]])
+        radii = np.array([0.3, 0.3, 0.3, 0.3])
+        
+        i, j, distance = find_overlapping_pair(positions, radii)
+        
+        assert (i, j) == (0, 3)
+        assert distance == pytest.approx(0.5)
+    
+    def test_matches_pairwise_check(self):
+        """Vectorized search agrees with a brute-force pairwise check."""
+        rng = np.random.default_rng(5)
+        positions = rng.uniform(0.0, 6.0, (40, 3))
+        radii = rng.uniform(0.1, 0.4, 40)
+        
+        expected = next(((i, j) for i in range(40) for j in range(i + 1, 40)
+                         if np.linalg.norm(positions[j] - positions[i]) < radii[i] + radii[j]), None)
+        
+        assert expected is not None
+        assert find_overlapping_pair(positions, radii)[:2] == expected
+
+
 class TestPerformBallBallCollision:
     def test_head_on_elastic_collision(self):
         """Test head-on elastic collision."""
@@ -308,8 +500,8 @@ class TestPerformBallBallCollision:
         ball2 = Ball(np.array([3.0, 2.0]), np.array([-1.0, 0.0]), 0.5, 1, (3, 2), time=1.0)
         
         # Store original states for validation
-        ball1_before = Ball(ball1.position.copy(), ball1.velocity.copy(), ball1.radius, ball1.index, ball1.cell)
-        ball2_before = Ball(ball2.position.copy(), ball2.velocity.copy(), ball2.radius, ball2.index, ball2.cell)
+        ball1_before = ball1.copy()
+        ball2_before = ball2.copy()
         
         perform_ball_ball_collision(ball1, ball2, restitution=1.0)
         
@@ -354,8 +546,8 @@ class TestPerformBallBallCollision:
         ball2 = Ball(np.array([2.5, 2.5]), np.array([-0.5, -0.5]), 0.5, 1, (2, 2), time=1.0)
         
         # Store original states for validation
-        ball1_before = Ball(ball1.position.copy(), ball1.velocity.copy(), ball1.radius, ball1.index, ball1.cell)
-        ball2_before = Ball(ball2.position.copy(), ball2.velocity.copy(), ball2.radius, ball2.index, ball2.cell)
+        ball1_before = ball1.copy()
+        ball2_before = ball2.copy()
         
         perform_ball_ball_collision(ball1, ball2, restitution=1.0)
         
@@ -386,25 +578,13 @@ class TestPerformBallBallCollision:
             cell=(2, 1)
         )
         
-        # Check if balls are actually overlapping/touching
-        distance = np.linalg.norm(ball1.position - ball2.position)
-        sum_radii = ball1.radius + ball2.radius
-        print(f"Distance between ball centers: {distance:.6f}")
-        print(f"Sum of radii: {sum_radii:.6f}")
-        print(f"Overlap: {distance < sum_radii}")
-        
         # Store original states for validation
-        ball1_before = Ball(ball1.position.copy(), ball1.velocity.copy(), ball1.radius, ball1.index, ball1.cell)
-        ball2_before = Ball(ball2.position.copy(), ball2.velocity.copy(), ball2.radius, ball2.index, ball2.cell)
+        ball1_before = ball1.copy()
+        ball2_before = ball2.copy()
         
         # Perform collision
         perform_ball_ball_collision(ball1, ball2, restitution=1.0)
         
-        print(f"Ball 1 velocity before: {ball1_before.velocity}")
-        print(f"Ball 1 velocity after:  {ball1.velocity}")
-        print(f"Ball 2 velocity before: {ball2_before.velocity}")
-        print(f"Ball 2 velocity after:  {ball2.velocity}")
-        
         # Validate physics - this should catch the issue if collision didn't work properly
         validate_collision_physics(ball1_before, ball2_before, ball1, ball2, restitution=1.0)
 
@@ -1,55 +1,41 @@
 import os
-import tempfile
+import json
 import shutil
 import pytest
-from src.simulation import run_simulation, validate_simulation_parameters, initialize_simulation
+import numpy as np
+from src.simulation import run_simulation, validate_simulation_parameters, initialize_simulation, read_binary_frames, OutputManager
+
+
+@pytest.fixture
+def base_params():
+    """Minimal valid parameter set for validate_simulation_parameters."""
+    return {
+        'ndim': 2,
+        'num_balls': 4,
+        'ball_radius': 0.3,
+        'domain_size': (3.0, 2.0),
+        'simulation_time': 1.0
+    }
 
 
 class TestSimulation:
     
-    def test_validate_simulation_parameters_valid(self):
-        params = {
-            'ndim': 2,
-            'num_balls': 4,
-            'ball_radius': 0.3,
-            'domain_size': (3.0, 2.0),
-            'simulation_time': 1.0
-        }
+    def test_validate_simulation_parameters_valid(self, base_params):
         # Should not raise
-        validate_simulation_parameters(params)
+        validate_simulation_parameters(base_params)
     
-    def test_validate_simulation_parameters_missing(self):
-        params = {
-            'ndim': 2,
-            'num_balls': 4,
-            # Missing ball_radius
-            'domain_size': (3.0, 2.0),
-            'simulation_time': 1.0
-        }
+    def test_validate_simulation_parameters_missing(self, base_params):
+        del base_params['ball_radius']
         with pytest.raises(ValueError, match="Missing required parameter"):
-            validate_simulation_parameters(params)
+            validate_simulation_parameters(base_params)
     
-    def test_validate_simulation_parameters_invalid_ndim(self):
-        params = {
-            'ndim': 1,  # Invalid
-            'num_balls': 4,
-            'ball_radius': 0.1,
-            'domain_size': (3.0,),
-            'simulation_time': 1.0
-        }
-        with pytest.raises(ValueError, match="ndim must be 2 or 3"):
-            validate_simulation_parameters(params)
-    
-    def test_validate_simulation_parameters_invalid_ball_radius(self):
-        params = {
-            'ndim': 2,
-            'num_balls': 4,
-            'ball_radius': 1.5,  # Larger than cell size
-            'domain_size': (3.0, 2.0),
-            'simulation_time': 1.0
-        }
-        with pytest.raises(ValueError, match="ball_radius must be smaller than cell size"):
-            validate_simulation_parameters(params)
+    @pytest.mark.parametrize("changes,match", [
+        ({'ndim': 1, 'ball_radius': 0.1, 'domain_size': (3.0,)}, "ndim must be 2 or 3"),
+        ({'ball_radius': 1.5}, "ball_radius must be smaller than cell size"),  # Larger than cell size
+    ])
+    def test_validate_simulation_parameters_invalid(self, base_params, changes, match):
+        with pytest.raises(ValueError, match=match):
+            validate_simulation_parameters({**base_params, **changes})
     
     def test_initialize_simulation_2d(self):
         params = {
@@ -60,7 +46,7 @@ class TestSimulation:
             'simulation_time': 1.0
         }
         
-        balls, walls, grid, event_heap, output_manager = initialize_simulation(params)
+        balls, walls, grid, event_heap, output_manager, state = initialize_simulation(params)
         
         assert len(balls) == 2
         assert len(walls) == 4  # 2D box has 4 walls
@@ -73,6 +59,10 @@ class TestSimulation:
         assert all(ball.radius == 0.3 for ball in balls)
         assert all(len(ball.position) == 2 for ball in balls)
         assert all(len(ball.velocity) == 2 for ball in balls)
+        
+        # Balls are views of the returned state arrays
+        assert np.shares_memory(balls[1].position, state.positions)
+        np.testing.assert_array_equal(state.cells, [ball.cell for ball in balls])
     
     def test_initialize_simulation_3d(self):
         params = {
@@ -83,7 +73,7 @@ class TestSimulation:
             'simulation_time': 1.0
         }
         
-        balls, walls, grid, event_heap, output_manager = initialize_simulation(params)
+        balls, walls, grid, event_heap, output_manager, state = initialize_simulation(params)
         
         assert len(balls) == 2
         assert len(walls) == 6  # 3D box has 6 walls
@@ -93,34 +83,201 @@ class TestSimulation:
         # Check balls are placed correctly
         assert all(len(ball.position) == 3 for ball in balls)
         assert all(len(ball.velocity) == 3 for ball in balls)
+        assert [ball.cell for ball in balls] == [(0, 0, 0), (1, 0, 0)]
+        np.testing.assert_array_equal(balls[1].position, [1.5, 0.5, 0.5])
     
-    def test_run_simulation_short(self):
+    def test_run_simulation_short(self, tmp_path):
         """Test a very short simulation to ensure it runs without errors."""
         
-        # Create temporary directory for output
-        with tempfile.TemporaryDirectory() as temp_dir:
-            params = {
-                'ndim': 2,
-                'num_balls': 2,
-                'ball_radius': 0.3,
-                'domain_size': (3.0, 2.0),
-                'simulation_time': 0.1,  # Very short
-                'gravity': False,
-                'ball_restitution': 1.0,
-                'wall_restitution': 1.0,
-                'output_rate': 0.05,
-                'run_name': 'test_run',
-                'output_dir': temp_dir
-            }
-            
-            # Should run without errors
-            run_simulation(params)
-            
-            # Check that output files were created in the run subdirectory
-            run_dir = os.path.join(temp_dir, 'test_run')
-            assert os.path.exists(run_dir)
-            output_files = [f for f in os.listdir(run_dir) if f.startswith('frame_')]
-            assert len(output_files) >= 1
+        temp_dir = str(tmp_path)
+        params = {
+            'ndim': 2,
+            'num_balls': 2,
+            'ball_radius': 0.3,
+            'domain_size': (3.0, 2.0),
+            'simulation_time': 0.1,  # Very short
+            'gravity': False,
+            'ball_restitution': 1.0,
+            'wall_restitution': 1.0,
+            'output_rate': 0.05,
+            'run_name': 'test_run',
+            'output_dir': temp_dir
+        }
+        
+        # Should run without errors
+        run_simulation(params)
+        
+        # Check that output files were created in the run subdirectory
+        run_dir = os.path.join(temp_dir, 'test_run')
+        assert os.path.exists(run_dir)
+        output_files = [f for f in os.listdir(run_dir) if f.startswith('frame_')]
+        assert len(output_files) >= 1
+    
+    def test_run_simulation_binary_output(self, tmp_path):
+        """Test that binary output writes a single frames file that reads back."""
+        
+        temp_dir = str(tmp_path)
+        params = {
+            'ndim': 3,
+            'num_balls': 3,
+            'ball_radius': 0.3,
+            'domain_size': (3.0, 3.0, 3.0),
+            'simulation_time': 0.1,
+            'gravity': True,
+            'output_rate': 0.05,
+            'run_name': 'test_run',
+            'output_dir': temp_dir,
+            'output_format': 'binary'
+        }
+        
+        run_simulation(params)
+        
+        run_dir = os.path.join(temp_dir, 'test_run')
+        assert not any(f.startswith('frame_') for f in os.listdir(run_dir))
+        
+        frames = read_binary_frames(os.path.join(run_dir, 'frames.bin'))
+        assert len(frames) >= 2
+        assert frames[0][0] == 0.0
+        for time, positions, velocities in frames:
+            assert positions.shape == (3, 3)
+            assert velocities.shape == (3, 3)
+            assert np.all(positions > 0.0)
+    
+    def test_binary_output_buffers_frames(self, tmp_path):
+        """Test that binary frames are held in memory until the buffer fills or the file is closed."""
+        
+        temp_dir = str(tmp_path)
+        output_manager = OutputManager(temp_dir, output_format='binary', buffer_size=2)
+        filename = os.path.join(temp_dir, 'frames.bin')
+        positions = np.array([[0.5, 0.5], [1.5, 0.5]])
+        velocities = np.array([[1.0, -1.0], [0.25, 2.0]])
+        
+        output_manager.write_frame(0.0, positions, velocities)
+        assert os.path.getsize(filename) == 0
+        
+        output_manager.write_frame(0.1, positions, velocities)
+        assert len(read_binary_frames(filename)) == 2
+        
+        output_manager.write_frame(0.2, positions, velocities)
+        assert len(read_binary_frames(filename)) == 2
+        
+        output_manager.close()
+        frames = read_binary_frames(filename)
+        assert [frame[0] for frame in frames] == [0.0, 0.1, 0.2]
+        np.testing.assert_array_equal(frames[2][1], positions)
+        np.testing.assert_array_equal(frames[2][2], velocities)
+    
+    @pytest.mark.parametrize("buffer_size", [0, -1])
+    def test_invalid_buffer_size(self, tmp_path, buffer_size):
+        """Test that a binary buffer must hold at least one frame."""
+        with pytest.raises(ValueError, match="buffer_size must be at least 1"):
+            OutputManager(str(tmp_path), output_format='binary', buffer_size=buffer_size)
+    
+    @pytest.mark.parametrize("simulation_time", [0.5, np.float64(0.5)])
+    def test_progress_log_is_json(self, tmp_path, capsys, simulation_time):
+        """Test that the pre-formatted progress lines are valid JSON."""
+        
+        temp_dir = str(tmp_path)
+        params = {
+            'ndim': 2,
+            'num_balls': 4,
+            'ball_radius': 0.3,
+            'domain_size': (3.0, 3.0),
+            'simulation_time': simulation_time,
+            'gravity': True,
+            'output_rate': 0.25,
+            'run_name': 'test_run',
+            'output_dir': temp_dir,
+            'progress_interval': 1
+        }
+        
+        run_simulation(params)
+        
+        progress = [json.loads(line) for line in capsys.readouterr().out.splitlines()
+                    if '"ProcessingEvent"' in line]
+        assert len(progress) > 0
+        assert [entry["event_count"] for entry in progress] == list(range(1, len(progress) + 1))
+        assert all(isinstance(entry["time"], float) for entry in progress)
+        assert all(entry["current_event"].endswith("valid=True)") for entry in progress)
+    
+    def test_log_times_never_go_backwards(self, tmp_path, capsys):
+        """Test that timed log lines, discards included, are printed in time order."""
+        
+        params = {
+            'ndim': 2,
+            'num_balls': 40,
+            'ball_radius': 0.3,
+            'domain_size': (8.0, 8.0),
+            'simulation_time': 5.0,
+            'gravity': True,
+            'output_rate': 1.0,
+            'run_name': 'test_run',
+            'output_dir': str(tmp_path)
+        }
+        
+        run_simulation(params)
+        
+        times = []
+        for line in capsys.readouterr().out.splitlines():
+            if line.startswith('{'):
+                entry = json.loads(line)
+                if 'time' in entry:
+                    times.append(entry['time'])
+        assert len(times) > 0
+        assert times == sorted(times)
+        assert times[-1] <= params['simulation_time']
+    
+    def test_start_log_without_ball_details(self, tmp_path, capsys):
+        """Test that log_init=False replaces the per-ball start log with an event count."""
+        
+        temp_dir = str(tmp_path)
+        params = {
+            'ndim': 2,
+            'num_balls': 4,
+            'ball_radius': 0.3,
+            'domain_size': (3.0, 3.0),
+            'simulation_time': 0.2,
+            'output_rate': 0.1,
+            'run_name': 'test_run',
+            'output_dir': temp_dir,
+            'log_init': False
+        }
+        
+        run_simulation(params)
+        
+        start_log = next(json.loads(line) for line in capsys.readouterr().out.splitlines()
+                         if '"SimulationStart"' in line)
+        assert "initial_balls" not in start_log
+        # At least one wall and one grid event per ball
+        assert start_log["initial_event_count"] >= 2 * 4
+    
+    @pytest.mark.parametrize("verbose", [False, True])
+    def test_start_log_neighbor_lists(self, tmp_path, capsys, verbose):
+        """Test that per-ball higher-indexed neighbor lists are logged only in verbose runs."""
+        
+        temp_dir = str(tmp_path)
+        params = {
+            'ndim': 2,
+            'num_balls': 4,
+            'ball_radius': 0.3,
+            'domain_size': (3.0, 3.0),
+            'simulation_time': 0.2,
+            'output_rate': 0.1,
+            'run_name': 'test_run',
+            'output_dir': temp_dir,
+            'verbose': verbose
+        }
+        
+        run_simulation(params)
+        
+        start_log = next(json.loads(line) for line in capsys.readouterr().out.splitlines()
+                         if '"SimulationStart"' in line)
+        neighbors = [ball.get("higher_neighbor_balls") for ball in start_log["initial_balls"]]
+        if verbose:
+            # Balls fill cells (0,0), (1,0), (2,0), (0,1)
+            assert neighbors == [[1, 3], [2, 3], [], []]
+        else:
+            assert neighbors == [None] * 4
     
     def test_too_many_balls_error(self):
         """Test that too many balls for domain size raises error."""
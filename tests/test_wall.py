@@ -1,6 +1,6 @@
 import numpy as np
 import pytest
-from src.wall import Wall, create_box_walls
+from src.wall import Wall, create_box_walls, pack_walls, wall_distances
 
 
 class TestWall:
@@ -12,34 +12,26 @@ class TestWall:
         assert wall.coordinate == 2.0
         assert wall.restitution == 0.9
     
-    def test_get_normal_vector_2d(self):
-        """Test normal vector calculation in 2D."""
-        # Wall perpendicular to x-axis (normal_axis=0)
-        wall_x = Wall(0, 1.0)
-        normal_x = wall_x.get_normal_vector(2)
-        np.testing.assert_array_equal(normal_x, [1.0, 0.0])
-        
-        # Wall perpendicular to y-axis (normal_axis=1)
-        wall_y = Wall(1, 1.0)
-        normal_y = wall_y.get_normal_vector(2)
-        np.testing.assert_array_equal(normal_y, [0.0, 1.0])
+    @pytest.mark.parametrize("normal_axis,ndim,expected", [
+        (0, 2, [1.0, 0.0]),
+        (1, 2, [0.0, 1.0]),
+        (0, 3, [1.0, 0.0, 0.0]),
+        (1, 3, [0.0, 1.0, 0.0]),
+        (2, 3, [0.0, 0.0, 1.0]),
+    ])
+    def test_get_normal_vector(self, normal_axis, ndim, expected):
+        """Test normal vector calculation for each axis in 2D and 3D."""
+        wall = Wall(normal_axis, 1.0)
+        np.testing.assert_array_equal(wall.get_normal_vector(ndim), expected)
     
-    def test_get_normal_vector_3d(self):
-        """Test normal vector calculation in 3D."""
-        # Wall perpendicular to x-axis (normal_axis=0)
-        wall_x = Wall(0, 1.0)
-        normal_x = wall_x.get_normal_vector(3)
-        np.testing.assert_array_equal(normal_x, [1.0, 0.0, 0.0])
-        
-        # Wall perpendicular to y-axis (normal_axis=1)
-        wall_y = Wall(1, 1.0)
-        normal_y = wall_y.get_normal_vector(3)
-        np.testing.assert_array_equal(normal_y, [0.0, 1.0, 0.0])
-        
-        # Wall perpendicular to z-axis (normal_axis=2)
-        wall_z = Wall(2, 1.0)
-        normal_z = wall_z.get_normal_vector(3)
-        np.testing.assert_array_equal(normal_z, [0.0, 0.0, 1.0])
+    def test_get_normal_vector_is_cached(self):
+        """Test that the normal vector is built once and cannot be modified."""
+        wall = Wall(1, 2.0)
+        
+        normal = wall.get_normal_vector(2)
+        assert wall.get_normal_vector(2) is normal
+        with pytest.raises(ValueError):
+            normal[0] = 1.0
     
     def test_distance_to_point(self):
         """Test distance calculation to wall."""
@@ -61,6 +53,23 @@ class TestWall:
         distance = wall.distance_to_point(point)
         assert distance == 0.0
     
+    def test_scalars_are_python_numbers(self):
+        """Test that NumPy scalar inputs are stored, and distances returned, as Python numbers."""
+        wall = Wall(np.int64(1), np.float64(2.0))
+        
+        assert type(wall.normal_axis) is int
+        assert type(wall.coordinate) is float
+        assert type(wall.distance_to_point(np.array([1.0, 3.5]))) is float
+    
+    def test_distances_to_points(self):
+        """Test batched distance calculation matches the single-point version."""
+        wall = Wall(1, 2.0)
+        points = np.array([[1.0, 3.0], [1.0, 1.0], [1.0, 2.0], [4.0, 5.5]])
+        
+        distances = wall.distances_to_points(points)
+        
+        np.testing.assert_array_equal(distances, [wall.distance_to_point(p) for p in points])
+    
     
     def test_repr(self):
         """Test string representation."""
@@ -151,4 +160,26 @@ class TestCreateBoxWalls:
     def test_create_box_walls_invalid_ndim(self):
         """Test that invalid dimensions raise error."""
         with pytest.raises(ValueError, match="Unsupported number of dimensions: 4"):
-            create_box_walls(ndim=4, box_size=(1, 1, 1, 1))
\ No newline at end of file
+            create_box_walls(ndim=4, box_size=(1, 1, 1, 1))
+    
+    def test_pack_walls(self):
+        """Test packing wall attributes into arrays."""
+        walls = create_box_walls(2, (4.0, 3.0), inset=0.1, restitution=0.8)
+        
+        normal_axes, coordinates, restitutions = pack_walls(walls)
+        
+        np.testing.assert_array_equal(normal_axes, [1, 1, 0, 0])
+        np.testing.assert_array_almost_equal(coordinates, [0.1, 2.9, 0.1, 3.9])
+        np.testing.assert_array_equal(restitutions, [0.8] * 4)
+    
+    def test_wall_distances(self):
+        """Test all point-wall distances are computed as one matrix."""
+        walls = create_box_walls(3, (4.0, 3.0, 2.0), inset=0.1)
+        normal_axes, coordinates, _ = pack_walls(walls)
+        points = np.array([[0.5, 0.5, 0.5], [3.5, 2.5, 1.5]])
+        
+        distances = wall_distances(points, normal_axes, coordinates)
+        
+        assert distances.shape == (2, 6)
+        expected = [[wall.distance_to_point(p) for wall in walls] for p in points]
+        np.testing.assert_array_almost_equal(distances, expected)